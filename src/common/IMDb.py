@@ -1,4 +1,18 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import collections
+import concurrent.futures
+
 import requests
+import requests.adapters
+import urllib3.util.retry
+
+from . import json_utils
 
 __all__ = [
     name for name in globals()
@@ -7,6 +21,302 @@ __all__ = [
 ]
 
 
+_SUGGESTION_URL = "https://v3.sg.media-imdb.com/suggestion/x/{}.json"
+_REQUEST_TIMEOUT = 10
+_POOL_SIZE = 32
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session():
+    """Return the module-wide keep-alive session, creating it on first use.
+
+    The session pools connections to the suggestion host and retries transient
+    failures (connection errors, 429 and 5xx responses) with exponential backoff.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = urllib3.util.retry.Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset({"GET"}),
+                )
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_SIZE, max_retries=retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+class _SuggestionCache:
+    """Bounded in-memory TTL + LRU cache of suggestion lists, with an optional
+    on-disk tier (one small JSON file per query) that survives restarts."""
+
+    def __init__(self, maxsize=1024, ttl=3600.0, disk_dir=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+        if self.disk_dir:
+            stored = json_utils.read_json_safe(self._disk_path(key))
+            if isinstance(stored, dict) and stored.get("expires", 0) > time.time():
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, stored["d"], stored["expires"] - time.time())
+                return stored["d"]
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._remember(key, value, self.ttl)
+        if self.disk_dir:
+            try:
+                json_utils.atomic_save_json(self._disk_path(key), {"q": key, "expires": time.time() + self.ttl, "d": value})
+            except OSError:
+                pass
+
+    def _remember(self, key, value, ttl):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "disk_dir": self.disk_dir,
+            }
+
+
+_cache = _SuggestionCache()
+
+
+def configure_imdb_cache(maxsize=1024, ttl=3600.0, disk_dir=None):
+    """Replace the suggestion cache used by all IMDb lookups.
+
+    Args:
+        maxsize (int): Maximum number of queries kept in memory (0 disables the memory tier).
+        ttl (float): Seconds a cached response stays valid.
+        disk_dir (str | None): Directory for the optional on-disk tier, or None to keep the cache in memory only.
+    """
+    global _cache
+    _cache = _SuggestionCache(maxsize=maxsize, ttl=ttl, disk_dir=disk_dir)
+
+
+def clear_imdb_cache():
+    """Drop all in-memory cache entries and reset the hit/miss counters.
+    Files in the on-disk tier are left in place and expire by their TTL."""
+    _cache.clear()
+
+
+def imdb_cache_info():
+    """Return cache statistics: hits, disk_hits, misses, size, maxsize, ttl and disk_dir."""
+    return _cache.info()
+
+
+class _TitleIndex:
+    """Persistent SQLite index of every suggestion entry seen in a response.
+
+    Two tables: `entries` keeps the raw suggestion JSON per IMDb id together
+    with its normalized title, and `queries` remembers which ids (in order) a
+    normalized query returned, so repeated queries can be answered offline.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    id TEXT PRIMARY KEY,
+                    norm_title TEXT NOT NULL,
+                    raw TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entries_norm_title ON entries (norm_title);
+                CREATE TABLE IF NOT EXISTS queries (
+                    query TEXT PRIMARY KEY,
+                    ids TEXT NOT NULL
+                );
+                """
+            )
+            self._conn.commit()
+
+    def record(self, query, results):
+        rows = [
+            (result["id"], _normalize_query(result.get("l", "")), json.dumps(result, ensure_ascii=False))
+            for result in results
+            if isinstance(result.get("id"), str)
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO entries (id, norm_title, raw) VALUES (?, ?, ?)", rows)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO queries (query, ids) VALUES (?, ?)",
+                (query, json.dumps([row[0] for row in rows])),
+            )
+
+    def _raw_by_ids(self, ids):
+        placeholders = ",".join("?" * len(ids))
+        found = dict(self._conn.execute(f"SELECT id, raw FROM entries WHERE id IN ({placeholders})", ids))
+        return [json.loads(found[i]) for i in ids if i in found]
+
+    def suggestions(self, query):
+        """Return a suggestion list for a normalized query, or None if the index cannot answer it."""
+        with self._lock:
+            row = self._conn.execute("SELECT ids FROM queries WHERE query = ?", (query,)).fetchone()
+            if row is not None:
+                ids = json.loads(row[0])
+                results = self._raw_by_ids(ids)
+                return results if len(results) == len(ids) else None
+            rows = self._conn.execute(
+                "SELECT raw FROM entries WHERE id = ? OR norm_title = ? ORDER BY id = ? DESC",
+                (query, query, query),
+            ).fetchall()
+        return [json.loads(raw) for (raw,) in rows] or None
+
+    def lookup(self, query, prefix=False, limit=20):
+        """Return raw entries whose id or normalized title equals (or starts with) `query`."""
+        if prefix:
+            # Range scan on the indexed column; "\U0010ffff" sorts after every other code point.
+            sql = ("SELECT raw FROM entries WHERE (norm_title >= ?1 AND norm_title < ?1 || '\U0010ffff')"
+                   " OR (id >= ?1 AND id < ?1 || '\U0010ffff') ORDER BY norm_title LIMIT ?2")
+        else:
+            sql = "SELECT raw FROM entries WHERE norm_title = ?1 OR id = ?1 ORDER BY id = ?1 DESC, norm_title LIMIT ?2"
+        with self._lock:
+            rows = self._conn.execute(sql, (query, limit)).fetchall()
+        return [json.loads(raw) for (raw,) in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_index = None
+
+
+def configure_imdb_index(path):
+    """Enable the offline title index stored in the SQLite file at `path`.
+
+    Every suggestion response fetched from the network is recorded in the
+    index, and lookups consult it before going to the network.
+    Pass None to disable (and close) the index.
+    """
+    global _index
+    if _index is not None:
+        _index.close()
+    _index = _TitleIndex(path) if path else None
+
+
+def lookup_imdb_index(query, prefix=False, limit=20):
+    """Search the offline title index without touching the network.
+
+    Args:
+        query (str): A title (matched after normalization) or an IMDb id such as "tt1375666".
+        prefix (bool): Match titles/ids starting with `query` instead of equal to it.
+        limit (int): Maximum number of results.
+
+    Returns:
+        list: Title dicts with 'id', 'title', 'year', 'type', 'url' and 'imageUrl' for matching titles
+              (an empty list if the index is disabled or nothing matches).
+    """
+    index = _index
+    if index is None:
+        return []
+    return [
+        {
+            "id": entry["id"],
+            "title": entry.get("l", ""),
+            "year": entry.get("y", None),
+            "type": entry.get("qid", None),
+            "url": f"https://www.imdb.com/title/{entry['id']}/",
+            "imageUrl": entry.get("i", {}).get("imageUrl", None) if "i" in entry else None,
+        }
+        for entry in index.lookup(_normalize_query(query), prefix=prefix, limit=limit)
+        if entry["id"].startswith("tt")
+    ]
+
+
+def _normalize_query(query):
+    """Collapse whitespace and case so equivalent queries share a cache entry."""
+    return " ".join(str(query).split()).casefold()
+
+
+def _fetch_suggestions(query, limiter=None):
+    """Fetch the suggestion list ("d") for `query` from IMDb's auto-suggest API.
+
+    Responses are served from the suggestion cache, then from the offline title
+    index (if enabled), before going to the network. If `limiter`
+    is given, its wait() is called before each network request (not on cache hits).
+
+    Raises:
+        requests.RequestException: on network errors, bad status codes or invalid JSON.
+    """
+    key = _normalize_query(query)
+    cache = _cache
+    results = cache.get(key)
+    if results is not None:
+        return results
+    index = _index
+    if index is not None:
+        results = index.suggestions(key)
+        if results is not None:
+            cache.put(key, results)
+            return results
+    if limiter is not None:
+        limiter.wait()
+    response = _get_session().get(_SUGGESTION_URL.format(requests.utils.quote(key)), timeout=_REQUEST_TIMEOUT)
+    response.raise_for_status()
+    results = response.json().get("d", [])
+    cache.put(key, results)
+    if index is not None:
+        index.record(key, results)
+    return results
 
 
 def get_first_imdb_title(name, print_error=False):
@@ -22,14 +332,8 @@ def get_first_imdb_title(name, print_error=False):
     """
     # Use IMDb's auto-suggest API (public, no API key needed)
     # It returns JSON with title suggestions matching the query
-    search_url = f"https://v3.sg.media-imdb.com/suggestion/x/{requests.utils.quote(name)}.json"
-
     try:
-        response = requests.get(search_url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        results = data.get("d", [])
+        results = _fetch_suggestions(name)
         if not results:
             return None
 
@@ -62,38 +366,111 @@ def get_imdb_title_info(name, print_error=False):
     """
     # Use IMDb's auto-suggest API (public, no API key needed)
     # It returns JSON with title suggestions matching the query
-    search_url = f"https://v3.sg.media-imdb.com/suggestion/x/{requests.utils.quote(name)}.json"
+    try:
+        return _title_info_from_results(_fetch_suggestions(name))
+    except requests.RequestException as e:
+        if print_error:
+            print(f"Error fetching IMDb title: {e}")
+        return None
 
+
+def _title_info_from_results(results):
+    """Build the get_imdb_title_info dict from the first title-type suggestion, or None."""
+    # Filter to only title results (qid starting with 'movie', 'tvSeries', etc.)
+    for result in results:
+        qid = result.get("qid", "")
+        if qid in ("movie", "tvSeries", "tvMovie", "tvMiniSeries", "short", "videoGame", "video"):
+            title_id = result.get("id", "")
+            if title_id.startswith("tt"):
+                return {
+                    "id": title_id,
+                    "title": result.get("l", ""),
+                    "year": result.get("y", None),
+                    "type": qid,
+                    "url": f"https://www.imdb.com/title/{title_id}/" if title_id else None,
+                    "imageUrl": result.get("i", {}).get("imageUrl", None) if "i" in result else None
+            }
+    return None
+
+
+class _RateLimiter:
+    """Thread-safe limiter that spaces calls to wait() at most `rate` per second."""
+
+    def __init__(self, rate):
+        self._interval = 1.0 / rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _title_info_or_error(query, limiter):
+    """Resolve one query for the batch API, returning the exception instead of raising it."""
     try:
-        response = requests.get(search_url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        return _title_info_from_results(_fetch_suggestions(query, limiter))
+    except requests.RequestException as e:
+        return e
 
-        results = data.get("d", [])
-        if not results:
-            return None
 
-        # Filter to only title results (qid starting with 'movie', 'tvSeries', etc.)
-        for result in results:
-            qid = result.get("qid", "")
-            if qid in ("movie", "tvSeries", "tvMovie", "tvMiniSeries", "short", "videoGame", "video"):
-                title_id = result.get("id", "")
-                if title_id.startswith("tt"):
-                    return {
-                        "id": title_id,
-                        "title": result.get("l", ""),
-                        "year": result.get("y", None),
-                        "type": qid,
-                        "url": f"https://www.imdb.com/title/{title_id}/" if title_id else None,
-                        "imageUrl": result.get("i", {}).get("imageUrl", None) if "i" in result else None
-                }
+def _prepare_batch(names, concurrency, rate_limit):
+    """Validate batch arguments and return (normalized queries in input order, unique queries, limiter)."""
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if rate_limit is not None and rate_limit <= 0:
+        raise ValueError("rate_limit must be positive")
+    queries = [_normalize_query(name) for name in names]
+    unique = list(dict.fromkeys(queries))
+    limiter = _RateLimiter(rate_limit) if rate_limit else None
+    return queries, unique, limiter
 
-        return None
 
-    except requests.RequestException as e:
-        if print_error:
-            print(f"Error fetching IMDb title: {e}")
-        return None
+def get_imdb_title_info_many(names, concurrency=8, rate_limit=None):
+    """Resolve many production names at once with get_imdb_title_info semantics.
+
+    Lookups run concurrently on a thread pool sharing the pooled session and
+    response cache. Duplicate names (after normalization) are fetched once.
+
+    Args:
+        names (iterable of str): Production names to look up.
+        concurrency (int): Maximum number of lookups in flight (default 8).
+        rate_limit (float | None): Maximum network requests per second across all workers, or None for no limit.
+
+    Returns:
+        list: One entry per input name, in input order. Each entry is the title info dict,
+              None if no title matched, or the requests.RequestException raised for that name.
+    """
+    queries, unique, limiter = _prepare_batch(names, concurrency, rate_limit)
+    if not unique:
+        return []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(concurrency, len(unique)), thread_name_prefix="imdb") as executor:
+        resolved = dict(zip(unique, executor.map(_title_info_or_error, unique, [limiter] * len(unique))))
+    return [resolved[query] for query in queries]
+
+
+async def get_imdb_title_info_many_async(names, concurrency=8, rate_limit=None):
+    """Asyncio counterpart of get_imdb_title_info_many.
+
+    The blocking HTTP calls run on a private thread pool, so the event loop
+    stays responsive. Arguments and return value are the same as for
+    get_imdb_title_info_many.
+    """
+    queries, unique, limiter = _prepare_batch(names, concurrency, rate_limit)
+    if not unique:
+        return []
+    loop = asyncio.get_running_loop()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(concurrency, len(unique)), thread_name_prefix="imdb")
+    try:
+        results = await asyncio.gather(*(loop.run_in_executor(executor, _title_info_or_error, query, limiter) for query in unique))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    resolved = dict(zip(unique, results))
+    return [resolved[query] for query in queries]
 
 
 def get_imdb_look_up(name, print_error=False):
@@ -108,14 +485,8 @@ def get_imdb_look_up(name, print_error=False):
         dict: A dictionary with title info for the first matching result, including 'id', 'title', 'year', 'type', and 'url',
               or None if no result is found or on error.
     """
-    search_url = f"https://v3.sg.media-imdb.com/suggestion/x/{requests.utils.quote(name)}.json"
-
     try:
-        response = requests.get(search_url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        results = data.get("d", [])
+        results = _fetch_suggestions(name)
         if not results:
             return None
 
@@ -140,14 +511,10 @@ def get_title_image(title_id, print_error=False):
     Returns:
         str: The URL of the title's image, or None if not found or on error.
     """
-    search_url = f"https://v3.sg.media-imdb.com/suggestion/x/{requests.utils.quote(title_id)}.json"
-
     try:
-        response = requests.get(search_url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        results = data.get("d", [])
+        results = _fetch_suggestions(title_id)
+        if not results:
+            return None
         return results[0]["i"]["imageUrl"] if "i" in results[0] and "imageUrl" in results[0]["i"] else None  # Return the first image URL if available
 
     except requests.RequestException as e:
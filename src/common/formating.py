@@ -1,4 +1,10 @@
 import math
+import bisect
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 __all__ = [
     name for name in globals()
@@ -49,16 +55,38 @@ def get_input_list(prompt:str, type_cast:type = int) -> list:
     return input_list
 
 
+_BYTE_SUFFIXES = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+_BYTE_INDEX = {suffix: i for i, suffix in enumerate(_BYTE_SUFFIXES)}
+_DURATION_UNITS = {
+    'nanoseconds': 1e-9,
+    'microseconds': 1e-6,
+    'milliseconds': 1e-3,
+    'seconds': 1,
+    'minutes': 60,
+    'hours': 3600,
+    'days': 86400,
+    'weeks': 604800,
+}
+
+
+def _bytes_divisor(inputsuffix: str, outputsuffix: str):
+    """Return the divisor converting inputsuffix to outputsuffix (1024 based)."""
+    if inputsuffix not in _BYTE_INDEX or outputsuffix not in _BYTE_INDEX:
+        raise ValueError("Invalid suffix provided.")
+    return 1024 ** (_BYTE_INDEX[outputsuffix] - _BYTE_INDEX[inputsuffix])
+
+
+def _duration_factors(input_unit: str, output_unit: str) -> tuple:
+    """Return (seconds per input unit, seconds per output unit)."""
+    if input_unit not in _DURATION_UNITS or output_unit not in _DURATION_UNITS:
+        raise ValueError("Invalid time unit provided.")
+    return _DURATION_UNITS[input_unit], _DURATION_UNITS[output_unit]
+
+
 def bytes_format_string(num_bytes: int, inputsuffix: str = 'B', outputsuffix: str = 'B', show_conversion: bool = False) -> str:
     
     """Convert bytes to a human-readable format. returns a string in the format 'XX.XX SUFFIX'."""
-    suffixes = ['B', 'KB', 'MB', 'GB', 'TB', 'PB']
-    if inputsuffix not in suffixes or outputsuffix not in suffixes:
-        raise ValueError("Invalid suffix provided.")
-    input_index = suffixes.index(inputsuffix)
-    output_index = suffixes.index(outputsuffix)
-    num_bytes_converted = num_bytes / (1024 ** (output_index - input_index))
-
+    num_bytes_converted = num_bytes / _bytes_divisor(inputsuffix, outputsuffix)
 
     if show_conversion:
         print(f"{num_bytes} {inputsuffix} = {num_bytes_converted:.2f} {outputsuffix}")
@@ -68,12 +96,7 @@ def bytes_format_string(num_bytes: int, inputsuffix: str = 'B', outputsuffix: st
 def bytes_format_tuple(num_bytes: int, inputsuffix: str = 'B', outputsuffix: str = 'B', show_conversion: bool = False):
     
     """Convert bytes to a human-readable format. returns tuple in format (converted_value, suffix)"""
-    suffixes = ['B', 'KB', 'MB', 'GB', 'TB', 'PB']
-    if inputsuffix not in suffixes or outputsuffix not in suffixes:
-        raise ValueError("Invalid suffix provided.")
-    input_index = suffixes.index(inputsuffix)
-    output_index = suffixes.index(outputsuffix)
-    num_bytes_converted = num_bytes / (1024 ** (output_index - input_index))
+    num_bytes_converted = num_bytes / _bytes_divisor(inputsuffix, outputsuffix)
 
     if show_conversion:
         print(f"{num_bytes} {inputsuffix} = {num_bytes_converted:.2f} {outputsuffix}")
@@ -82,19 +105,8 @@ def bytes_format_tuple(num_bytes: int, inputsuffix: str = 'B', outputsuffix: str
 
 def duration_format_string(length: int, input_unit: str, output_unit: str, show_conversion: bool = False) -> str:   
     """Convert duration to a human-readable format. returns a string in the format 'XX.XX UNIT'."""
-    units_in_seconds = {
-        'seconds': 1,
-        'minutes': 60,
-        'hours': 3600,
-        'days': 86400,
-        'weeks': 604800,
-    }
-
-    if input_unit not in units_in_seconds or output_unit not in units_in_seconds:
-        raise ValueError("Invalid time unit provided.")
-
-    length_in_seconds = length * units_in_seconds[input_unit]
-    converted_length = length_in_seconds / units_in_seconds[output_unit]
+    input_seconds, output_seconds = _duration_factors(input_unit, output_unit)
+    converted_length = length * input_seconds / output_seconds
 
     if show_conversion:
         return f"{length} {input_unit} = {converted_length:.2f} {output_unit}"
@@ -103,25 +115,171 @@ def duration_format_string(length: int, input_unit: str, output_unit: str, show_
 
 def duration_format_tuple(length: int, input_unit: str, output_unit: str, show_conversion: bool = False):   
     """Convert duration to a human-readable format. returns tuple in format (converted_value, unit)"""
-    units_in_seconds = {
-        'seconds': 1,
-        'minutes': 60,
-        'hours': 3600,
-        'days': 86400,
-        'weeks': 604800,
-    }
-
-    if input_unit not in units_in_seconds or output_unit not in units_in_seconds:
-        raise ValueError("Invalid time unit provided.")
-
-    length_in_seconds = length * units_in_seconds[input_unit]
-    converted_length = length_in_seconds / units_in_seconds[output_unit]
+    input_seconds, output_seconds = _duration_factors(input_unit, output_unit)
+    converted_length = length * input_seconds / output_seconds
 
     if show_conversion:
         print(f"{length} {input_unit} = {converted_length:.2f} {output_unit}")
     return (converted_length, output_unit)
 
 
+_SI_SUFFIXES = ('B', 'kB', 'MB', 'GB', 'TB', 'PB')
+_BINARY_SCALES = tuple(1024 ** i for i in range(len(_BYTE_SUFFIXES)))
+_SI_SCALES = tuple(1000 ** i for i in range(len(_SI_SUFFIXES)))
+_DURATION_SCALES = tuple(_DURATION_UNITS.values())
+_BINARY_FORMATS = tuple(f"{{:.2f}} {unit}".format for unit in _BYTE_SUFFIXES)
+_SI_FORMATS = tuple(f"{{:.2f}} {unit}".format for unit in _SI_SUFFIXES)
+_DURATION_FORMATS = tuple(f"{{:.2f}} {unit}".format for unit in _DURATION_UNITS)
+_MAX_BINARY_INDEX = len(_BYTE_SUFFIXES) - 1
+
+
+def _next_ratios(scales) -> tuple:
+    """Size of the next unit in units of each scale (inf for the largest unit)."""
+    return tuple(round(b / a, 9) for a, b in zip(scales, scales[1:])) + (math.inf,)
+
+
+# a value that the '.2f' formats round up to the next unit (1023.999 B) is shown in that unit
+_BINARY_NEXT = _next_ratios(_BINARY_SCALES)
+_SI_NEXT = _next_ratios(_SI_SCALES)
+_DURATION_NEXT = _next_ratios(_DURATION_SCALES)
+_AUTO_TABLES = {
+    'binary': (_BINARY_SCALES, _BYTE_SUFFIXES, _BINARY_FORMATS, _BINARY_NEXT),
+    'si': (_SI_SCALES, _SI_SUFFIXES, _SI_FORMATS, _SI_NEXT),
+    'duration': (_DURATION_SCALES, tuple(_DURATION_UNITS), _DURATION_FORMATS, _DURATION_NEXT),
+}
+
+
+def _auto_index(value, kind: str) -> int:
+    """Index of the unit to show abs(value) in: the largest unit not above it (one bit_length/frexp
+    for binary units, one bisect otherwise), or the next one when the value rounds up to it."""
+    value = abs(value)
+    scales, _, _, ratios = _AUTO_TABLES[kind]
+    if kind == 'binary':
+        bits = value.bit_length() if type(value) is int else math.frexp(value)[1]
+        i = min(max(bits - 1, 0) // 10, _MAX_BINARY_INDEX)
+    else:
+        i = bisect.bisect_right(scales, value) - 1
+        if i < 0:
+            i = 0
+    return i + 1 if round(value / scales[i], 2) >= ratios[i] else i
+
+
+def bytes_format_auto(num_bytes, inputsuffix: str = 'B', si: bool = False) -> str:
+    """Convert bytes to a human-readable string, picking the unit automatically (1024 based, or 1000 based with si=True)."""
+    if inputsuffix != 'B':
+        num_bytes = num_bytes / _bytes_divisor(inputsuffix, 'B')
+    magnitude = abs(num_bytes)
+    if si:
+        i = bisect.bisect_right(_SI_SCALES, magnitude) - 1
+        if i < 0:
+            i = 0
+        if round(magnitude / _SI_SCALES[i], 2) >= _SI_NEXT[i]:
+            i += 1
+        return _SI_FORMATS[i](num_bytes / _SI_SCALES[i])
+    bits = magnitude.bit_length() if type(magnitude) is int else math.frexp(magnitude)[1]
+    i = (bits - 1) // 10 if bits > 10 else 0
+    if i > _MAX_BINARY_INDEX:
+        i = _MAX_BINARY_INDEX
+    if round(magnitude / _BINARY_SCALES[i], 2) >= _BINARY_NEXT[i]:
+        i += 1
+    return _BINARY_FORMATS[i](num_bytes / _BINARY_SCALES[i])
+
+
+def duration_format_auto(length, input_unit: str = 'seconds') -> str:
+    """Convert a duration to a human-readable string, picking the unit automatically (nanoseconds to weeks)."""
+    if input_unit != 'seconds':
+        length = length * _duration_factors(input_unit, 'seconds')[0]
+    magnitude = abs(length)
+    i = bisect.bisect_right(_DURATION_SCALES, magnitude) - 1
+    if i < 0:
+        i = 0
+    if round(magnitude / _DURATION_SCALES[i], 2) >= _DURATION_NEXT[i]:
+        i += 1
+    return _DURATION_FORMATS[i](length / _DURATION_SCALES[i])
+
+
+def _auto_many(values, multiplier, kind: str, shared_unit: bool, as_tuple: bool):
+    """Shared implementation of the auto-scaling bulk formatters."""
+    scales, units, formats, ratios = _AUTO_TABLES[kind]
+    if np is not None:
+        values = np.asarray(values, dtype=np.float64).ravel() * multiplier
+        magnitudes = np.abs(values)
+        if shared_unit:
+            magnitudes = magnitudes.max(initial=0.0)
+        if kind == 'binary':
+            index = np.clip((np.frexp(magnitudes)[1] - 1) // 10, 0, len(scales) - 1)
+        else:
+            index = np.clip(np.searchsorted(scales, magnitudes, side='right') - 1, 0, len(scales) - 1)
+        scales = np.asarray(scales, dtype=np.float64)
+        index = index + (np.round(magnitudes / scales[index], 2) >= np.asarray(ratios)[index])
+        converted = values / scales[index]
+        index = index.tolist()
+        values_out = converted
+        converted = converted.tolist()
+    else:
+        values = [v * multiplier for v in values]
+        if shared_unit:
+            index = _auto_index(max(map(abs, values), default=0), kind)
+            converted = [v / scales[index] for v in values]
+        else:
+            index = [_auto_index(v, kind) for v in values]
+            converted = [v / scales[i] for v, i in zip(values, index)]
+        values_out = converted
+    if shared_unit:
+        if as_tuple:
+            return (values_out, units[index])
+        return list(map(formats[index], converted))
+    if as_tuple:
+        return (values_out, [units[i] for i in index])
+    return [formats[i](v) for v, i in zip(converted, index)]
+
+
+def bytes_format_auto_many(values, inputsuffix: str = 'B', si: bool = False, shared_unit: bool = False, as_tuple: bool = False):
+    """Bulk bytes_format_auto. shared_unit=True formats the whole column in the unit of its largest value.
+    returns a list of strings, or (converted_values, unit or list of units) when as_tuple is True."""
+    multiplier = 1 / _bytes_divisor(inputsuffix, 'B')
+    return _auto_many(values, multiplier, 'si' if si else 'binary', shared_unit, as_tuple)
+
+
+def duration_format_auto_many(values, input_unit: str = 'seconds', shared_unit: bool = False, as_tuple: bool = False):
+    """Bulk duration_format_auto. shared_unit=True formats the whole column in the unit of its largest value.
+    returns a list of strings, or (converted_values, unit or list of units) when as_tuple is True."""
+    multiplier = _duration_factors(input_unit, 'seconds')[0]
+    return _auto_many(values, multiplier, 'duration', shared_unit, as_tuple)
+
+
+def _convert_many(values, multiplier, divisor):
+    """Return values * multiplier / divisor as a NumPy float array, or a list without NumPy."""
+    if np is not None:
+        return np.asarray(values, dtype=np.float64).ravel() * multiplier / divisor
+    return [v * multiplier / divisor for v in values]
+
+
+def _format_many(converted, unit: str) -> list:
+    """Format converted values as 'XX.XX UNIT' strings."""
+    if np is not None:
+        converted = converted.tolist()
+    return list(map(f"{{:.2f}} {unit}".format, converted))
+
+
+def bytes_format_many(values, inputsuffix: str = 'B', outputsuffix: str = 'B', as_tuple: bool = False):
+    """Bulk bytes_format_string/bytes_format_tuple for a sequence or NumPy array.
+    returns a list of 'XX.XX SUFFIX' strings, or (converted_values, suffix) when as_tuple is True."""
+    converted = _convert_many(values, 1, _bytes_divisor(inputsuffix, outputsuffix))
+    if as_tuple:
+        return (converted, outputsuffix)
+    return _format_many(converted, outputsuffix)
+
+
+def duration_format_many(values, input_unit: str, output_unit: str, as_tuple: bool = False):
+    """Bulk duration_format_string/duration_format_tuple for a sequence or NumPy array.
+    returns a list of 'XX.XX UNIT' strings, or (converted_values, unit) when as_tuple is True."""
+    converted = _convert_many(values, *_duration_factors(input_unit, output_unit))
+    if as_tuple:
+        return (converted, output_unit)
+    return _format_many(converted, output_unit)
+
+
 
 def printNoNewLine(*args, **kwargs):
     """Prints the given arguments without adding a newline at the end."""
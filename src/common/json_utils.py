@@ -2,9 +2,32 @@ import os
 import json
 import tempfile
 import hashlib
+import mmap
 from typing import Any, Optional, Callable
 import time
 import shutil
+import re
+import threading
+import warnings
+import collections
+import contextlib
+import types
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
 
 __all__ = [
     name for name in globals()
@@ -13,8 +36,137 @@ __all__ = [
 ]
 
 
-def get_json(path: str, base_dir: str = None,fullbackup: bool = False, fallbacktype:type = []) -> Any:
-    """Load JSON from a path."""
+_JSON_BACKENDS = ("orjson", "ujson", "json")
+_backend = "orjson" if orjson is not None else "ujson" if ujson is not None else "json"
+
+
+def set_json_backend(name: str = "auto") -> str:
+    """Select the serializer used by this module: "orjson", "ujson", "json" (stdlib)
+    or "auto" (the fastest one installed). Returns the selected backend name."""
+    global _backend
+    if name == "auto":
+        name = "orjson" if orjson is not None else "ujson" if ujson is not None else "json"
+    if name not in _JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {name!r}")
+    if name != "json" and globals()[name] is None:
+        raise ValueError(f"JSON backend {name!r} is not installed")
+    _backend = name
+    return name
+
+
+def get_json_backend() -> str:
+    """Return the name of the active JSON backend."""
+    return _backend
+
+
+def dumps_json(obj: Any, *, compact: bool = False, indent: Optional[int] = 2, sort_keys: bool = False, keep_nan: bool = False) -> bytes:
+    """Serialize `obj` straight to UTF-8 bytes with the active backend.
+
+    Non-ASCII text is written as-is (ensure_ascii=False semantics). `compact`
+    drops all whitespace (same as indent=None). orjson only supports indent 2;
+    other indents, and values a fast backend rejects (integers beyond 64 bits),
+    are handled by the stdlib. orjson writes NaN/Infinity as null; pass
+    `keep_nan=True` to have the stdlib write them as NaN/Infinity instead.
+    """
+    if compact:
+        indent = None
+    if _backend == "orjson" and indent in (None, 2) and not keep_nan:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=_json_default, option=option)
+        except TypeError:
+            pass
+    elif _backend == "ujson":
+        try:
+            return ujson.dumps(obj, ensure_ascii=False, indent=indent or 0, sort_keys=sort_keys, escape_forward_slashes=False).encode("utf-8")
+        except (TypeError, OverflowError):
+            pass
+    separators = (",", ":") if indent is None else None
+    return json.dumps(obj, ensure_ascii=False, indent=indent, sort_keys=sort_keys, separators=separators, default=_json_default).encode("utf-8")
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode the read-only objects of cache="frozen" (MappingProxyType) like dicts."""
+    if isinstance(obj, types.MappingProxyType):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# 19+ digit runs may be integers beyond 64 bits, which orjson turns into floats
+_LONG_DIGITS = re.compile(rb"\d{19}")
+_LONG_DIGITS_STR = re.compile(r"\d{19}")
+
+
+def loads_json(data) -> Any:
+    """Parse JSON from bytes (without a separate decode step when the backend allows) or str.
+
+    Anything the fast backend rejects is re-parsed by the stdlib, so accepted
+    input and json.JSONDecodeError messages match the json module. Input that
+    may hold integers beyond 64 bits (any run of 19+ digits) skips orjson,
+    which would load them as floats.
+    """
+    if _backend == "orjson":
+        long_digits = _LONG_DIGITS_STR if isinstance(data, str) else _LONG_DIGITS
+        if long_digits.search(data) is None:
+            try:
+                return orjson.loads(data)
+            except ValueError:
+                pass
+    if isinstance(data, (bytearray, memoryview)):
+        data = bytes(data)
+    if _backend == "ujson":
+        try:
+            return ujson.loads(data)
+        except ValueError:
+            pass
+    return json.loads(data)
+
+
+_mmap_min_size = None  # opt-in: see configure_mmap
+_HASH_BLOCK = 8 << 20
+
+
+def configure_mmap(min_size: Optional[int] = 1 << 20) -> None:
+    """Memory-map files of at least `min_size` bytes when loading or hashing them
+    (None, the default, disables memory mapping). Only enable it when every writer
+    replaces files (atomic_save_json): a mapped file that another process truncates
+    in place (e.g. with save_json) while it is being read crashes the reader with
+    SIGBUS on POSIX."""
+    global _mmap_min_size
+    _mmap_min_size = min_size
+
+
+@contextlib.contextmanager
+def _file_view(f):
+    """Yield a read-only memoryview of the open binary file `f`, memory-mapped
+    when it is at least the mmap threshold, otherwise read into memory."""
+    size = os.fstat(f.fileno()).st_size
+    if _mmap_min_size is None or size < max(_mmap_min_size, 1):
+        yield memoryview(f.read())
+        return
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+
+
+def _load_json_file(path: str) -> Any:
+    """Parse the JSON file at `path` straight from its (possibly mapped) bytes."""
+    with open(path, "rb") as f, _file_view(f) as data:
+        return loads_json(data)
+
+
+def get_json(path: str, base_dir: str = None,fullbackup: bool = False, fallbacktype:type = [], cache: Optional[str] = None) -> Any:
+    """Load JSON from a path.
+
+    `cache` ("copy" or "frozen") serves repeated reads from the stat-validated read cache, see configure_json_cache.
+    """
     if os.path.isabs(path):
         json_path = path
     else:
@@ -23,8 +175,9 @@ def get_json(path: str, base_dir: str = None,fullbackup: bool = False, fallbackt
         json_path = os.path.join(base_dir, path)
 
     try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        if cache is not None:
+            return _cached_load(json_path, cache)
+        return _load_json_file(json_path)
     except FileNotFoundError:
         if fullbackup:
             return fallbacktype  # return empty instance of the specified type (e.g. [] or {})
@@ -33,8 +186,9 @@ def get_json(path: str, base_dir: str = None,fullbackup: bool = False, fallbackt
         raise RuntimeError(f"Failed to parse {json_path}: {e}")
 
 
-def save_json(file_name: str, data, base_dir: str = None, writepath: bool = True):
-    """Save JSON to a path."""
+def save_json(file_name: str, data, base_dir: str = None, writepath: bool = True, compact: bool = False, keep_nan: bool = False):
+    """Save JSON to a path. `compact` writes machine-only JSON without indentation,
+    `keep_nan` writes NaN/Infinity instead of null (see dumps_json)."""
     if os.path.isabs(file_name):
         json_path = file_name
     else:
@@ -44,42 +198,58 @@ def save_json(file_name: str, data, base_dir: str = None, writepath: bool = True
 
     try:
         os.makedirs(os.path.dirname(json_path), exist_ok=True)
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        payload = dumps_json(data, indent=None if compact else 4, keep_nan=keep_nan)
+        with open(json_path, "wb") as f:
+            f.write(payload)
+        invalidate_json_cache(json_path)
         if writepath:
             print(f"Saved JSON to {json_path}")
     except Exception as e:
         raise RuntimeError(f"Failed to save to {json_path}: {e}")
 
 
-def atomic_save_json(path, obj):
+def atomic_save_json(path, obj, compact: bool = False, keep_nan: bool = False):
     """
     Docstring for atomic_save_json
     
     :param path: Description
     :param obj: Description
+    :param compact: write machine-only JSON without indentation
+    :param keep_nan: write NaN/Infinity instead of null (see dumps_json)
     """
+    payload = dumps_json(obj, compact=compact, keep_nan=keep_nan)
     d = os.path.dirname(path) or "."
     fd, tmp = tempfile.mkstemp(dir=d)
-    with os.fdopen(fd, "w", encoding="utf-8") as f:
-        json.dump(obj, f, ensure_ascii=False, indent=2)
+    with os.fdopen(fd, "wb") as f:
+        f.write(payload)
         f.flush(); os.fsync(f.fileno())
     os.replace(tmp, path)
+    invalidate_json_cache(path)
 
 
-def read_json_safe(path: str, default: Any = None, *, max_size: int = 5_000_000, raise_on_error: bool = False) -> Any:
+def read_json_safe(path: str, default: Any = None, *, max_size: int = 5_000_000, raise_on_error: bool = False, lock: bool = False, cache: Optional[str] = None) -> Any:
     """Read JSON from `path`. Returns `default` if missing or too large.
 
     If JSON is malformed and `raise_on_error` is True, raises RuntimeError.
+    With `lock`, a shared file_lock is held while reading, so the read waits
+    for any in-progress locked atomic_update; a missing file returns `default`
+    without creating anything.
+    `cache` ("copy" or "frozen") serves repeated reads from the stat-validated read cache, see configure_json_cache.
     """
+    if lock:
+        if not os.path.exists(path):
+            return default  # nothing to wait for; don't create the lock file or its directory
+        with file_lock(path, shared=True):
+            return read_json_safe(path, default, max_size=max_size, raise_on_error=raise_on_error, cache=cache)
     try:
         size = os.path.getsize(path)
         if size > max_size:
             if raise_on_error:
                 raise RuntimeError(f"File too large: {path} ({size} bytes)")
             return default
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        if cache is not None:
+            return _cached_load(path, cache)
+        return _load_json_file(path)
     except FileNotFoundError:
         return default
     except json.JSONDecodeError as e:
@@ -88,37 +258,332 @@ def read_json_safe(path: str, default: Any = None, *, max_size: int = 5_000_000,
         return default
 
 
-def atomic_update(path, updater_fn):
-    obj = read_json_safe(path, default={})
-    new = updater_fn(obj)
-    atomic_save_json(path, new)
-    return new
+def _json_copy(obj: Any) -> Any:
+    """Deep copy of a JSON-shaped object (much cheaper than copy.deepcopy)."""
+    if isinstance(obj, dict):
+        return {k: _json_copy(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_json_copy(v) for v in obj]
+    return obj
+
 
+def _json_freeze(obj: Any) -> Any:
+    """Read-only view of a JSON-shaped object: dicts become MappingProxyType, lists tuples."""
+    if isinstance(obj, dict):
+        return types.MappingProxyType({k: _json_freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_json_freeze(v) for v in obj)
+    return obj
 
-def compute_etag(obj):
-    s = json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()
-    return hashlib.sha256(s).hexdigest()
 
+class _JSONReadCache:
+    """LRU cache of parsed JSON files, validated by (st_mtime_ns, st_size, st_ino)
+    and bounded by the total size in bytes of the cached files."""
 
-def compute_etag(obj_or_path) -> str:
-    """Return hex sha256 for a file path (reads bytes) or Python object (canonical JSON)."""
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries = collections.OrderedDict()  # abspath -> [signature, size, parsed, frozen or None]
+        self._lock = threading.Lock()
+
+    def load(self, path: str, mode: str) -> Any:
+        if mode not in ("copy", "frozen"):
+            raise ValueError(f"cache must be 'copy' or 'frozen', not {mode!r}")
+        key = os.path.abspath(path)
+        st = os.stat(key)
+        sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == sig:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                entry = None
+                self.misses += 1
+        if entry is None:
+            entry = [sig, st.st_size, _load_json_file(key), None]
+            self._store(key, entry)
+        if mode == "copy":
+            return _json_copy(entry[2])
+        if entry[3] is None:
+            entry[3] = _json_freeze(entry[2])
+        return entry[3]
+
+    def _store(self, key: str, entry: list) -> None:
+        with self._lock:
+            self._discard(key)
+            if entry[1] > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._bytes += entry[1]
+            while self._bytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self._bytes -= old[1]
+
+    def _discard(self, key: str) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                self._discard(os.path.abspath(path))
+
+    def info(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
+_read_cache = _JSONReadCache(64 * 1024 * 1024)
+
+
+def _cached_load(path: str, mode: str) -> Any:
+    return _read_cache.load(path, mode)
+
+
+def configure_json_cache(max_bytes: int = 64 * 1024 * 1024) -> None:
+    """Set the byte budget (sum of cached file sizes) of the read cache used by
+    get_json/read_json_safe(cache=...); shrinking evicts least recently used files."""
+    with _read_cache._lock:
+        _read_cache.max_bytes = max_bytes
+        while _read_cache._bytes > max_bytes:
+            _, old = _read_cache._entries.popitem(last=False)
+            _read_cache._bytes -= old[1]
+
+
+def invalidate_json_cache(path: Optional[str] = None) -> None:
+    """Drop `path` (or every file, if None) from the read cache.
+    save_json and atomic_save_json call this automatically."""
+    _read_cache.invalidate(path)
+
+
+def json_cache_info() -> dict:
+    """Return read cache statistics: hits, misses, entries, bytes and max_bytes."""
+    return _read_cache.info()
+
+_ETAG_CHUNK = 1 << 16
+_ETAG_INLINE_LEN = 16
+_ETAG_BATCH = 256
+
+
+def _new_hasher(algorithm: str):
+    """Return a fresh hash object for `algorithm` ("sha256", "blake2b", "xxhash" or any hashlib name)."""
+    if algorithm == "blake2b":
+        return hashlib.blake2b(digest_size=32)
+    if algorithm == "xxhash":
+        try:
+            import xxhash
+        except ImportError:
+            raise ValueError("algorithm 'xxhash' requires the xxhash package") from None
+        return xxhash.xxh3_128()
+    try:
+        return hashlib.new(algorithm)
+    except ValueError:
+        raise ValueError(f"Unknown hash algorithm: {algorithm!r}") from None
+
+
+# cache="frozen" turns objects into MappingProxyType and arrays into tuples
+_JSON_OBJECTS = (dict, types.MappingProxyType)
+_JSON_ARRAYS = (list, tuple)
+_JSON_CONTAINERS = _JSON_OBJECTS + _JSON_ARRAYS
+
+
+def _all_small(values) -> bool:
+    """True if every value is a scalar or a small container: fewer than _ETAG_INLINE_LEN
+    members, nested at most two levels deep (e.g. a row with a short list of tags)."""
+    for value in values:
+        if isinstance(value, _JSON_OBJECTS):
+            members = value.values()
+        elif isinstance(value, _JSON_ARRAYS):
+            members = value
+        else:
+            continue
+        if len(value) >= _ETAG_INLINE_LEN:
+            return False
+        for member in members:
+            if isinstance(member, _JSON_OBJECTS):
+                inner = member.values()
+            elif isinstance(member, _JSON_ARRAYS):
+                inner = member
+            else:
+                continue
+            if len(member) >= _ETAG_INLINE_LEN:
+                return False
+            for item in inner:
+                if isinstance(item, _JSON_CONTAINERS):
+                    return False
+    return True
+
+
+def _canonical_chunks(obj: Any, depth: int = 0):
+    """Yield canonical JSON (sorted keys, no whitespace, ASCII) for `obj` in pieces.
+
+    The pieces concatenate to exactly json.dumps(obj, sort_keys=True,
+    separators=(",", ":")). Containers are walked unless they are small (see
+    _all_small); runs of small members are encoded together in one
+    C-accelerated dumps call, so memory stays bounded by a batch of small
+    members rather than the document.
+    """
+    walk = isinstance(obj, _JSON_CONTAINERS) and (depth < 2 or not _all_small((obj,)))
+    if walk and isinstance(obj, _JSON_OBJECTS) and all(type(k) is str for k in obj):
+        keys = sorted(obj)
+        yield "{"
+        for start in range(0, len(keys), _ETAG_BATCH):
+            batch = keys[start:start + _ETAG_BATCH]
+            if start:
+                yield ","
+            if _all_small(map(obj.__getitem__, batch)):
+                yield json.dumps({key: obj[key] for key in batch}, sort_keys=True, separators=(",", ":"), default=_json_default)[1:-1]
+                continue
+            for i, key in enumerate(batch):
+                yield ("," if i else "") + json.dumps(key) + ":"
+                yield from _canonical_chunks(obj[key], depth + 1)
+        yield "}"
+    elif walk and isinstance(obj, _JSON_ARRAYS):
+        yield "["
+        for start in range(0, len(obj), _ETAG_BATCH):
+            batch = obj[start:start + _ETAG_BATCH]
+            if start:
+                yield ","
+            if _all_small(batch):
+                yield json.dumps(batch, sort_keys=True, separators=(",", ":"), default=_json_default)[1:-1]
+                continue
+            for i, item in enumerate(batch):
+                if i:
+                    yield ","
+                yield from _canonical_chunks(item, depth + 1)
+        yield "]"
+    else:
+        yield json.dumps(obj, sort_keys=True, separators=(",", ":"), default=_json_default)
+
+
+_file_etags = collections.OrderedDict()  # (abspath, algorithm) -> (stat signature, etag)
+_file_etags_lock = threading.Lock()
+
+
+def compute_etag(obj_or_path, algorithm: str = "sha256") -> str:
+    """Return a hex digest for a file path (reads bytes) or Python object (canonical JSON).
+
+    Objects are hashed while their canonical JSON is being produced, so the full
+    blob is never held in memory. File digests are cached by the file's
+    (st_mtime_ns, st_size, st_ino). `algorithm` is "sha256" (default),
+    "blake2b", "xxhash" (requires the xxhash package) or any hashlib name.
+    """
     if isinstance(obj_or_path, str) and os.path.exists(obj_or_path):
-        h = hashlib.sha256()
+        key = (os.path.abspath(obj_or_path), algorithm)
+        st = os.stat(obj_or_path)
+        sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        with _file_etags_lock:
+            cached = _file_etags.get(key)
+            if cached is not None and cached[0] == sig:
+                _file_etags.move_to_end(key)
+                return cached[1]
+        h = _new_hasher(algorithm)
         with open(obj_or_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                h.update(chunk)
-        return h.hexdigest()
-    # canonical JSON for stable hashing
-    blob = json.dumps(obj_or_path, sort_keys=True, separators=(",", ":")).encode("utf-8")
-    return hashlib.sha256(blob).hexdigest()
+            if _mmap_min_size is not None and st.st_size >= max(_mmap_min_size, 1):
+                with _file_view(f) as data:
+                    for start in range(0, len(data), _HASH_BLOCK):
+                        h.update(data[start:start + _HASH_BLOCK])
+            else:
+                buf = bytearray(min(max(st.st_size, 1), 1 << 20))
+                view = memoryview(buf)
+                while n := f.readinto(buf):
+                    h.update(view[:n])
+        etag = h.hexdigest()
+        with _file_etags_lock:
+            _file_etags[key] = (sig, etag)
+            if len(_file_etags) > 256:
+                _file_etags.popitem(last=False)
+        return etag
+    # canonical JSON for stable hashing, fed to the hasher in ~64 KiB batches
+    h = _new_hasher(algorithm)
+    batch, size = [], 0
+    for piece in _canonical_chunks(obj_or_path):
+        batch.append(piece)
+        size += len(piece)
+        if size >= _ETAG_CHUNK:
+            h.update("".join(batch).encode("utf-8"))
+            batch, size = [], 0
+    h.update("".join(batch).encode("utf-8"))
+    return h.hexdigest()
+
+
+@contextlib.contextmanager
+def file_lock(path: str, *, shared: bool = False, timeout: Optional[float] = 10.0):
+    """Hold an advisory lock for `path` for the duration of the with-block.
+
+    The lock is taken on the sidecar file `<path>.lock` (not on `path` itself,
+    which atomic_save_json replaces). Shared locks let readers run together;
+    an exclusive lock waits for all of them. Uses fcntl.flock, or msvcrt on
+    Windows, where every lock is exclusive.
+    `timeout` is in seconds (None waits forever); raises RuntimeError when it expires.
+    """
+    lock_path = path + ".lock"
+    d = os.path.dirname(lock_path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            if timeout is None:
+                fcntl.flock(f.fileno(), mode)
+            else:
+                _acquire_with_timeout(lambda: fcntl.flock(f.fileno(), mode | fcntl.LOCK_NB), path, timeout)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            _acquire_with_timeout(lambda: msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1), path, timeout)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
 
 
-def atomic_update(path: str, updater_fn: Callable[[Any], Any], *, max_retries: int = 5, retry_delay: float = 0.1, read_default: Any = None) -> Any:
+def _acquire_with_timeout(try_lock: Callable[[], None], path: str, timeout: Optional[float]) -> None:
+    """Call the non-blocking `try_lock` until it succeeds, backing off from 1ms up to 50ms."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delay = 0.001
+    while True:
+        try:
+            try_lock()
+            return
+        except OSError:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise RuntimeError(f"Timed out waiting for lock on {path}")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+
+def atomic_update(path: str, updater_fn: Callable[[Any], Any], *, max_retries: int = 5, retry_delay: float = 0.1, read_default: Any = None, lock: bool = True, lock_timeout: Optional[float] = 10.0) -> Any:
     """Load JSON, call updater_fn(current)->new, then write atomically.
 
-    Retries if concurrent modification detected (naive optimistic retry).
+    With `lock` (the default) an exclusive file_lock is held across the whole
+    read-modify-write, so concurrent updaters in other threads or processes
+    are serialized and none of their changes are lost.
+    With lock=False it falls back to the old naive optimistic retry, which
+    cannot detect concurrent writers.
     Returns the new object.
     """
+    if lock:
+        with file_lock(path, timeout=lock_timeout):
+            current = read_json_safe(path, default=read_default)
+            new = updater_fn(json.loads(json.dumps(current)))  # deep copy via dump/load
+            if new is None:
+                raise RuntimeError("updater_fn must return the new object")
+            if compute_etag(current, "blake2b") != compute_etag(new, "blake2b"):
+                atomic_save_json(path, new)
+            return new
+
     for attempt in range(max_retries):
         current = read_json_safe(path, default=read_default)
         new = updater_fn(json.loads(json.dumps(current)))  # deep copy via dump/load
@@ -136,24 +601,519 @@ def atomic_update(path: str, updater_fn: Callable[[Any], Any], *, max_retries: i
     raise RuntimeError("Failed to update JSON after retries")
 
 
-def backup_json(path: str, *, keep: int = 5, backup_dir: Optional[str] = None) -> str:
-    """Copy `path` to a timestamped backup file and keep newest `keep` backups."""
+_BACKUP_SUFFIXES = {None: ".bak", "gzip": ".bak.gz", "zstd": ".bak.zst"}
+
+
+def backup_json(path: str, *, keep: int = 5, backup_dir: Optional[str] = None, compress: Optional[str] = None, dedupe: bool = True) -> str:
+    """Copy `path` to a timestamped backup file and keep newest `keep` backups.
+
+    Backups are tracked in a small manifest (`<name>.backups.json` in
+    `backup_dir`) holding each backup's file name and content etag, so rotation
+    never rescans the directory. With `dedupe`, an unchanged file is not backed
+    up again (the newest backup's path is returned), and content identical to
+    an older kept backup is hardlinked instead of copied.
+    `compress` is None, "gzip" or "zstd" (requires the zstandard package).
+    """
+    if compress not in _BACKUP_SUFFIXES:
+        raise ValueError(f"Unknown compression: {compress!r}")
     if backup_dir is None:
         backup_dir = os.path.dirname(path) or "."
     os.makedirs(backup_dir, exist_ok=True)
-    ts = time.strftime("%Y%m%dT%H%M%S")
     name = os.path.basename(path)
-    backup_name = f"{name}.{ts}.bak"
-    backup_path = os.path.join(backup_dir, backup_name)
-    shutil.copy2(path, backup_path)
-    # rotate
-    entries = [p for p in os.listdir(backup_dir) if p.startswith(name + ".") and p.endswith(".bak")]
-    entries.sort(reverse=True)
-    for old in entries[keep:]:
+    manifest_path = os.path.join(backup_dir, f"{name}.backups.json")
+    suffix = _BACKUP_SUFFIXES[compress]
+
+    with file_lock(manifest_path):
+        entries = read_json_safe(manifest_path, default=None)
+        if entries is None:
+            # first run: adopt backups made before the manifest existed
+            entries = [{"file": p, "etag": None} for p in sorted(os.listdir(backup_dir)) if p.startswith(name + ".") and p.endswith(".bak")]
+        entries = [e for e in entries if os.path.exists(os.path.join(backup_dir, e["file"]))]
+
+        etag = compute_etag(path, "blake2b") if dedupe else None
+        same = [e for e in entries if etag is not None and e["etag"] == etag and e["file"].endswith(suffix)]
+        if same and same[-1] is entries[-1]:
+            return os.path.join(backup_dir, same[-1]["file"])
+
+        ts = time.strftime("%Y%m%dT%H%M%S")
+        backup_name = f"{name}.{ts}{suffix}"
+        n = 1
+        while os.path.exists(os.path.join(backup_dir, backup_name)):
+            backup_name = f"{name}.{ts}-{n}{suffix}"
+            n += 1
+        backup_path = os.path.join(backup_dir, backup_name)
+
+        linked = False
+        if same:
+            try:
+                os.link(os.path.join(backup_dir, same[-1]["file"]), backup_path)
+                linked = True
+            except OSError:
+                pass
+        if not linked:
+            _write_backup(path, backup_path, compress)
+        entries.append({"file": backup_name, "etag": etag})
+
+        # rotate
+        for old in entries[:-keep] if keep > 0 else entries:
+            try:
+                os.remove(os.path.join(backup_dir, old["file"]))
+            except Exception:
+                pass
+        entries = entries[-keep:] if keep > 0 else []
+        atomic_save_json(manifest_path, entries, compact=True)
+    return backup_path
+
+
+def _write_backup(src: str, dest: str, compress: Optional[str]) -> None:
+    """Copy `src` to `dest`, compressing with gzip or zstd when requested."""
+    if compress is None:
+        shutil.copy2(src, dest)
+        return
+    if compress == "gzip":
+        import gzip
+        with open(src, "rb") as fin, gzip.open(dest, "wb", compresslevel=6) as fout:
+            shutil.copyfileobj(fin, fout, 1 << 20)
+    else:
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("compress='zstd' requires the zstandard package") from None
+        with open(src, "rb") as fin, open(dest, "wb") as fout:
+            zstandard.ZstdCompressor().copy_stream(fin, fout)
+    shutil.copystat(src, dest)
+
+
+def restore_json_backup(backup_path: str, path: str) -> None:
+    """Atomically restore a (possibly gzip/zstd-compressed) backup made by backup_json to `path`."""
+    d = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(dir=d)
+    with os.fdopen(fd, "wb") as fout:
+        if backup_path.endswith(".gz"):
+            import gzip
+            with gzip.open(backup_path, "rb") as fin:
+                shutil.copyfileobj(fin, fout, 1 << 20)
+        elif backup_path.endswith(".zst"):
+            import zstandard
+            with open(backup_path, "rb") as fin:
+                zstandard.ZstdDecompressor().copy_stream(fin, fout)
+        else:
+            with open(backup_path, "rb") as fin:
+                shutil.copyfileobj(fin, fout, 1 << 20)
+        fout.flush(); os.fsync(fout.fileno())
+    os.replace(tmp, path)
+    invalidate_json_cache(path)
+
+
+def _journal_apply(state: Any, record: dict) -> Any:
+    """Apply one journal change record to `state` and return the new state."""
+    op = record["op"]
+    if op == "replace":
+        return record["value"]
+    keys = record["path"]
+    if not keys:
+        raise ValueError(f"Journal record needs a non-empty path: {record}")
+    parent = state
+    for key in keys[:-1]:
+        parent = parent.setdefault(key, {}) if op != "del" else parent.get(key, {})
+    last = keys[-1]
+    if op == "set":
+        parent[last] = record["value"]
+    elif op == "inc":
+        parent[last] = parent.get(last, 0) + record["value"]
+    elif op == "del":
+        parent.pop(last, None)
+    else:
+        raise ValueError(f"Unknown journal op: {op!r}")
+    return state
+
+
+class JSONJournal:
+    """Journaled JSON document: a snapshot file plus an append-only JSON Lines log.
+
+    Changes are applied in memory and appended to `<path>.journal` as small
+    records; a background thread writes and fsyncs pending records every
+    `fsync_interval` seconds, so many changes share one fsync (group commit).
+    When the log grows past `compact_threshold` bytes the state is written to
+    `path` with atomic_save_json and the log is restarted.
+
+    The first log line records the etag of the snapshot file's bytes it applies
+    to, so a crash between writing the snapshot and restarting the log never
+    replays changes twice. A log whose base does not match the snapshot is kept
+    as `<path>.journal.stale` (with a warning) instead of being discarded.
+    Single-writer: only one process may open a journal at a time.
+    """
+
+    def __init__(self, path: str, *, default: Any = None, fsync_interval: float = 0.05, compact_threshold: int = 4_000_000):
+        self.path = path
+        self.log_path = path + ".journal"
+        self.fsync_interval = fsync_interval
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._pending = []
+        self._closed = False
+        self._wake = threading.Event()
+
+        self._state = read_json_safe(path, default={} if default is None else default, max_size=float("inf"), raise_on_error=True)
+        base = self._snapshot_etag()
+        self._log_size = 0
+        stale = False
         try:
-            os.remove(os.path.join(backup_dir, old))
-        except Exception:
+            with open(self.log_path, "rb") as f:
+                header = f.readline()
+                if header.endswith(b"\n") and loads_json(header).get("base") == base:
+                    self._log_size = len(header)
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            break  # torn final write from a crash
+                        self._state = _journal_apply(self._state, loads_json(line))
+                        self._log_size += len(line)
+                else:
+                    stale = bool(header)
+        except FileNotFoundError:
             pass
-    return backup_path
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
+            raise RuntimeError(f"Failed to replay {self.log_path}: {e}")
+        if stale:
+            # usually a crash right after a compaction (its changes are already in `path`),
+            # but the snapshot may also have been replaced: keep the log for inspection
+            os.replace(self.log_path, self.log_path + ".stale")
+            warnings.warn(f"{self.log_path} does not match snapshot {self.path}; kept as {self.log_path}.stale")
+        if self._log_size:
+            os.truncate(self.log_path, self._log_size)  # drop a torn final line, if any
+            self._log = open(self.log_path, "ab")
+        else:
+            self._log = self._start_log(base)
+
+        self._flusher = None
+        if fsync_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name="json-journal", daemon=True)
+            self._flusher.start()
+
+    @property
+    def data(self) -> Any:
+        """The current in-memory state (do not mutate it directly)."""
+        return self._state
+
+    def get(self, path=(), default: Any = None) -> Any:
+        """Return the value at `path` (a key or a sequence of keys), or `default`."""
+        value = self._state
+        for key in self._keys(path):
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                return default
+        return value
+
+    def set(self, path, value: Any) -> None:
+        """Set the value at `path`, creating intermediate objects as needed."""
+        self._append({"op": "set", "path": self._keys(path), "value": value})
+
+    def increment(self, path, amount: float = 1) -> Any:
+        """Add `amount` to the number at `path` (missing counts as 0) and return the new value."""
+        with self._lock:
+            self._append({"op": "inc", "path": self._keys(path), "value": amount})
+            return self.get(path)
 
+    def delete(self, path) -> None:
+        """Remove the key at `path` if it exists."""
+        self._append({"op": "del", "path": self._keys(path)})
 
+    def update(self, updater_fn: Callable[[Any], Any]) -> Any:
+        """atomic_update-style full replacement; logs the whole new document, so prefer set/increment/delete."""
+        with self._lock:
+            new = updater_fn(json.loads(json.dumps(self._state)))
+            if new is None:
+                raise RuntimeError("updater_fn must return the new object")
+            self._append({"op": "replace", "value": new})
+            return new
+
+    def flush(self) -> None:
+        """Write and fsync every pending change now (compacting if the log grew too large)."""
+        with self._lock:
+            self._flush_locked()
+            if self._log_size > self.compact_threshold:
+                self._compact_locked()
+
+    def compact(self) -> None:
+        """Write the current state as the snapshot and restart the log."""
+        with self._lock:
+            self._compact_locked()
+
+    def close(self) -> None:
+        """Flush pending changes and stop the background flusher."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wake.set()
+            self.flush()
+            self._log.close()
+        if self._flusher is not None:
+            self._flusher.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _keys(path) -> list:
+        if isinstance(path, (list, tuple)):
+            return list(path)
+        return [path]
+
+    def _append(self, record: dict) -> None:
+        line = dumps_json(record, compact=True) + b"\n"
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"Journal is closed: {self.path}")
+            self._state = _journal_apply(self._state, record)
+            self._pending.append(line)
+            if self._flusher is None:
+                self.flush()
+
+    def _flush_locked(self) -> None:
+        """Write and fsync pending records; never compacts. Caller holds the lock."""
+        if not self._pending:
+            return
+        chunk = b"".join(self._pending)
+        self._pending.clear()
+        self._log.write(chunk)
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._log_size += len(chunk)
+
+    def _compact_locked(self) -> None:
+        """Snapshot the state and restart the log, exactly once. Caller holds the lock."""
+        self._flush_locked()
+        atomic_save_json(self.path, self._state)
+        self._log.close()
+        self._log = self._start_log(self._snapshot_etag())
+
+    def _snapshot_etag(self) -> Optional[str]:
+        """etag of the snapshot file's bytes (None while it does not exist)."""
+        return compute_etag(self.path) if os.path.exists(self.path) else None
+
+    def _start_log(self, base: str):
+        """Atomically replace the log with an empty one based on snapshot etag `base`."""
+        d = os.path.dirname(self.log_path) or "."
+        header = dumps_json({"base": base}, compact=True) + b"\n"
+        fd, tmp = tempfile.mkstemp(dir=d)
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.flush(); os.fsync(f.fileno())
+        os.replace(tmp, self.log_path)
+        self._log_size = len(header)
+        return open(self.log_path, "ab")
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.fsync_interval)
+            with self._lock:
+                if self._closed:
+                    return
+                self.flush()
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_CONTAINER_SCAN = re.compile(r'["\[\]{}]')
+_STRING_SCAN = re.compile(r'["\\]')
+_SIMPLE_STRING = re.compile(r'"[^"\\]*"')
+_NUMBER_TAIL = re.compile(r"[0-9eE+\-.]*")
+
+
+class _JSONStream:
+    """Cursor over a JSON text file that only keeps an unconsumed window in memory.
+
+    Values are decoded with json.JSONDecoder.raw_decode on the window; values that
+    are skipped are scanned bracket-by-bracket and never materialized.
+    """
+
+    def __init__(self, f, chunk_size: int):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.offset = 0  # characters discarded before buf[0]
+        self.eof = False
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        if self.eof:
+            return False
+        data = self._f.read(size or self._chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.offset += self.pos
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def _error(self, msg: str):
+        raise ValueError(f"{msg}: char {self.offset + self.pos}")
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of file)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def decode(self) -> Any:
+        """Decode and consume the value at the cursor."""
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self.buf, self.pos)
+                # Strings and containers end unambiguously; a number at the end of
+                # the window (e.g. "12" or "2.5e") may continue in the next chunk.
+                if self.eof or self.buf[self.pos] in '{["' or _NUMBER_TAIL.match(self.buf, end).end() < len(self.buf):
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise ValueError(f"{e.msg}: char {self.offset + e.pos}") from None
+            self._fill(size)
+            size *= 2
+
+    def skip(self) -> None:
+        """Consume the value at the cursor without building it."""
+        if self.peek() not in "{[":
+            self.decode()
+            return
+        depth = 0
+        in_string = False
+        pos = self.pos
+        while True:
+            m = (_STRING_SCAN if in_string else _CONTAINER_SCAN).search(self.buf, pos)
+            if m is None:
+                pos = len(self.buf)
+            else:
+                token = m.group()
+                pos = m.end()
+                if in_string:
+                    if token == "\\":
+                        pos += 1  # skip the escaped character
+                    else:
+                        in_string = False
+                elif token == '"':
+                    # fast path: a string without escapes that ends inside the window
+                    simple = _SIMPLE_STRING.match(self.buf, m.start())
+                    if simple is not None:
+                        pos = simple.end()
+                    else:
+                        in_string = True
+                elif token in "[{":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        self.pos = pos
+                        return
+                if pos < len(self.buf):
+                    continue
+            # window exhausted: drop it and keep scanning in the next chunk
+            overshoot = pos - len(self.buf)
+            self.pos = len(self.buf)
+            if not self._fill():
+                self._error("Unterminated value")
+            pos = overshoot
+
+    def members(self):
+        """Yield the keys (object) or indices (array) of the container at the cursor.
+
+        After each yield the cursor is on the member's value, which the caller
+        must consume with decode() or skip() before advancing.
+        """
+        opener = self.peek()
+        closer = "}" if opener == "{" else "]"
+        self.pos += 1
+        index = 0
+        while True:
+            c = self.peek()
+            if c == closer:
+                self.pos += 1
+                return
+            if index:
+                if c != ",":
+                    self._error(f"Expecting ',' or '{closer}' delimiter")
+                self.pos += 1
+                c = self.peek()
+            if opener == "{":
+                if c != '"':
+                    self._error("Expecting property name enclosed in double quotes")
+                key = self.decode()
+                if self.peek() != ":":
+                    self._error("Expecting ':' delimiter")
+                self.pos += 1
+                yield key
+            else:
+                yield index
+            index += 1
+
+
+def iter_json(path: str, selector=None, *, chunk_size: int = 1 << 16):
+    """Stream a JSON file without loading it whole.
+
+    Yields the elements of a top-level array, or (key, value) pairs of a
+    top-level object, one at a time; a scalar document is yielded as a single
+    value. `selector` picks a subtree to stream instead: a dotted string
+    ("data.items" / "rows.0") or a list of keys and indices.
+    Memory use is bounded by the largest yielded element plus `chunk_size`.
+    The rest of the file is still scanned after the selected subtree, and
+    anything but whitespace after the document is an error, as with json.load.
+
+    Raises RuntimeError if the file is missing, malformed, or the selector does not match.
+    """
+    if selector is None:
+        components = []
+    elif isinstance(selector, str):
+        components = selector.split(".") if selector else []
+    else:
+        components = list(selector)
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            stream = _JSONStream(f, chunk_size)
+            parents = []  # members() of each selected container, resumed at the end
+            for component in components:
+                container = stream.peek()
+                if container not in "{[" or container == "":
+                    raise RuntimeError(f"Selector {selector!r} not found in {path}")
+                members = stream.members()
+                for name in members:
+                    if name == component if container == "{" else str(name) == str(component):
+                        break
+                    stream.skip()
+                else:
+                    raise RuntimeError(f"Selector {selector!r} not found in {path}")
+                parents.append(members)
+
+            container = stream.peek()
+            if container == "{":
+                for key in stream.members():
+                    yield key, stream.decode()
+            elif container == "[":
+                for _ in stream.members():
+                    yield stream.decode()
+            elif container == "":
+                stream._error("Expecting value")
+            else:
+                yield stream.decode()
+
+            # like json.load, reject anything but whitespace after the document
+            for members in reversed(parents):
+                for _ in members:
+                    stream.skip()
+            if stream.peek() != "":
+                stream._error("Extra data")
+    except FileNotFoundError:
+        raise RuntimeError(f"JSON file not found: {path}")
+    except ValueError as e:
+        raise RuntimeError(f"Failed to parse {path}: {e}")
@@ -1,4 +1,16 @@
+import csv
 import math
+import os
+import random
+import array
+import collections
+import concurrent.futures
+import itertools
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 __all__ = [
     name for name in globals()
@@ -7,35 +19,406 @@ __all__ = [
 ]
 
 
+_SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47,
+                 53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+_MR_BASES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)  # deterministic for n < 2**64
+_MR_EXTRA_ROUNDS = 16  # random bases added for n >= 2**64
+_random = random.Random()
+
+
+def _miller_rabin(n: int, bases) -> bool:
+    """Miller-Rabin test of odd n > 2 against the given bases."""
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for a in bases:
+        a %= n
+        if a < 2:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
 def is_prime(n: int) -> bool:
-    """Check if a number is prime."""
-    if n <= 1:
+    """Check if a number is prime (Miller-Rabin: deterministic below 2**64, probabilistic above)."""
+    if n < 2:
         return False
-    if n <= 3:
+    for p in _SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < 97 * 97:
         return True
-    if n % 2 == 0 or n % 3 == 0:
-        return False
-    i = 5
-    while i * i <= n:
-        if n % i == 0 or n % (i + 2) == 0:
-            return False
-        i += 6
-    return True
+    if n < 1 << 64:
+        return _miller_rabin(n, _MR_BASES_64)
+    bases = _SMALL_PRIMES[:12] + tuple(_random.randrange(2, n - 1) for _ in range(_MR_EXTRA_ROUNDS))
+    return _miller_rabin(n, bases)
+
+
+def _pollard_brent(n: int) -> int:
+    """Return a non-trivial factor of the odd composite n (Pollard's rho, Brent's variant)."""
+    while True:
+        y, c, m = _random.randrange(1, n), _random.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r <<= 1
+        if g == n:
+            # the batched product overshot: retrace one step at a time
+            while True:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+                if g > 1:
+                    break
+        if g != n:
+            return g
+
+
+def _strip_small_factors(n: int, factors: list[int]) -> int:
+    """Divide the small primes out of n, appending them to factors; return the cofactor."""
+    for p in _SMALL_PRIMES:
+        while n % p == 0:
+            n //= p
+            factors.append(p)
+    return n
+
+
+def factorize(n: int) -> list[int]:
+    """Return the prime factors of n (with multiplicity) in ascending order."""
+    if n < 1:
+        raise ValueError(f"factorize needs a positive integer, got {n}")
+    if n < len(_spf_table):
+        factors = []
+        while n > 1:
+            p = int(_spf_table[n])
+            factors.append(p)
+            n //= p
+        return factors
+    factors = []
+    stack = [_strip_small_factors(n, factors)]
+    while stack:
+        m = stack.pop()
+        if m == 1:
+            continue
+        if is_prime(m):
+            factors.append(m)
+            continue
+        d = _pollard_brent(m)
+        stack.extend((d, m // d))
+    factors.sort()
+    return factors
 
 
 def is_allmost_prime(n: int) -> bool:
     """Check if a number is almost prime (product of two primes)."""
-    count = 0
-    for i in range(2, int(math.sqrt(n)) + 1):
-        while n % i == 0:
-            n //= i
-            count += 1
-            if count > 2:
-                return False
-    if n > 1:
-        count += 1
-    return count == 2
+    if n < 4:
+        return False
+    if n < len(_omega_table):
+        return _omega_table[n] == 2
+    factors = []
+    m = _strip_small_factors(n, factors)
+    if len(factors) > 2:
+        return False
+    if m == 1:
+        return len(factors) == 2
+    if len(factors) == 2:
+        return False
+    if is_prime(m):
+        return len(factors) == 1
+    if factors:
+        return False
+    d = _pollard_brent(m)
+    return is_prime(d) and is_prime(m // d)
+
+
+_SEGMENT_ODDS = 1 << 18          # odd numbers covered by one sieve segment
+_PRIME_TABLE_LIMIT = 1 << 24     # largest value answered from the cached prime table
+_SIEVE_MAX_ROOT = 1 << 20        # sieve spans of large values only while sqrt(max) stays this small
+_prime_table = bytearray()       # _prime_table[n] == 1 iff n is prime, for n < len(_prime_table)
+
+
+def _odd_base_primes(limit: int) -> list[int]:
+    """Return the odd primes <= limit using an odd-only sieve."""
+    if limit < 3:
+        return []
+    size = (limit - 1) // 2  # index i <-> 2*i + 3
+    sieve = bytearray(b"\x01") * size
+    for i in range((math.isqrt(limit) - 1) // 2):
+        if sieve[i]:
+            p = 2 * i + 3
+            start = (p * p - 3) // 2
+            sieve[start::p] = bytes(len(range(start, size, p)))
+    return [2 * i + 3 for i in itertools.compress(range(size), sieve)]
+
+
+def _prime_segments(a: int, b: int):
+    """Yield the primes in [a, b] one segment at a time (segmented Sieve of
+    Eratosthenes over odd numbers). Segments are NumPy arrays when NumPy is
+    installed, otherwise lists."""
+    a = max(a, 2)
+    if b < a:
+        return
+    if a == 2:
+        yield np.array([2], dtype=np.int64) if np is not None else [2]
+        a = 3
+    a |= 1
+    base = _odd_base_primes(math.isqrt(b))
+    for lo in range(a, b + 1, 2 * _SEGMENT_ODDS):
+        hi = min(lo + 2 * _SEGMENT_ODDS - 2, b)
+        size = (hi - lo) // 2 + 1  # index i <-> lo + 2*i
+        seg = np.ones(size, dtype=np.bool_) if np is not None else bytearray(b"\x01") * size
+        for p in base:
+            if p * p > hi:
+                break
+            start = max(p * p, -(-lo // p) * p)
+            if start % 2 == 0:
+                start += p
+            idx = (start - lo) // 2
+            if idx < size:
+                if np is not None:
+                    seg[idx::p] = False
+                else:
+                    seg[idx::p] = bytes(len(range(idx, size, p)))
+        if np is not None:
+            yield np.flatnonzero(seg) * 2 + lo
+        else:
+            yield [lo + 2 * i for i in itertools.compress(range(size), seg)]
+
+
+def primes_in_range(a: int, b: int) -> list[int]:
+    """Return all primes p with a <= p <= b, using a segmented sieve (memory O(sqrt(b) + segment))."""
+    primes = []
+    for seg in _prime_segments(a, b):
+        primes.extend(seg.tolist() if np is not None else seg)
+    return primes
+
+
+def primes_up_to(n: int) -> list[int]:
+    """Return all primes <= n, using a segmented sieve."""
+    return primes_in_range(2, n)
+
+
+def _prime_table_up_to(n: int) -> bytearray:
+    """Return the cached prime table, growing it (to the next power of two) to cover n."""
+    global _prime_table
+    if len(_prime_table) <= n:
+        size = 1 << max(16, n.bit_length())
+        table = bytearray(b"\x01") * size
+        table[0:2] = b"\x00\x00"
+        for p in range(2, math.isqrt(size - 1) + 1):
+            if table[p]:
+                table[p * p::p] = bytes(len(range(p * p, size, p)))
+        _prime_table = table
+    return _prime_table
+
+
+def _sieve_worthwhile(lo: int, hi: int, count: int) -> bool:
+    """Whether sieving [lo, hi] beats count Miller-Rabin tests: the values must be dense
+    in their span and the base primes (up to sqrt(hi)) few enough to list."""
+    return math.isqrt(hi) <= _SIEVE_MAX_ROOT and hi - lo <= 8 * count
+
+
+def is_prime_many(values):
+    """Check primality for many integers at once.
+
+    Values up to 2**24 are answered from a cached sieve table. Larger values are
+    answered from a segmented sieve over their span when they are dense and below 2**40,
+    and with is_prime otherwise.
+    Returns a NumPy bool array of the same shape for NumPy input, else a list of bools.
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        return _is_prime_many_numpy(values)
+    values = [int(v) for v in values]
+    small_max = max((v for v in values if v <= _PRIME_TABLE_LIMIT), default=0)
+    table = _prime_table_up_to(small_max)
+    large = [v for v in values if v > _PRIME_TABLE_LIMIT]
+    large_primes = None
+    if large:
+        lo, hi = min(large), max(large)
+        if _sieve_worthwhile(lo, hi, len(large)):
+            large_primes = set()
+            for seg in _prime_segments(lo, hi):
+                large_primes.update(seg.tolist() if np is not None else seg)
+    result = []
+    for v in values:
+        if v <= _PRIME_TABLE_LIMIT:
+            result.append(v >= 0 and table[v] == 1)
+        elif large_primes is not None:
+            result.append(v in large_primes)
+        else:
+            result.append(is_prime(v))
+    return result
+
+
+def _is_prime_many_numpy(arr):
+    """NumPy implementation of is_prime_many."""
+    if arr.dtype.kind not in "iu":
+        raise ValueError(f"is_prime_many needs an integer array, got dtype {arr.dtype}")
+    flat = arr.ravel()
+    out = np.zeros(flat.shape, dtype=np.bool_)
+    small = (flat >= 0) & (flat <= _PRIME_TABLE_LIMIT)
+    if small.any():
+        vals = flat[small].astype(np.int64)
+        table = np.frombuffer(_prime_table_up_to(int(vals.max())), dtype=np.bool_)
+        out[small] = table[vals]
+    large = flat > _PRIME_TABLE_LIMIT
+    if large.any():
+        vals = flat[large]
+        lo, hi = int(vals.min()), int(vals.max())
+        if _sieve_worthwhile(lo, hi, vals.size):
+            mark = np.zeros(hi - lo + 1, dtype=np.bool_)
+            for seg in _prime_segments(lo, hi):
+                mark[seg - lo] = True
+            out[large] = mark[(vals - lo).astype(np.int64)]
+        else:
+            out[large] = [is_prime(int(v)) for v in vals]
+    return out.reshape(arr.shape)
+
+
+_FACTOR_TABLE_LIMIT = 1 << 24    # largest value answered from the cached factor tables
+_spf_table = array.array("I")          # smallest prime factor of n, for n < len(_spf_table)
+_omega_table = bytearray()       # number of prime factors of n (with multiplicity)
+
+
+def _spf_up_to(n: int):
+    """Return the cached smallest-prime-factor table, growing it (to the next power of two) to cover n."""
+    global _spf_table
+    if len(_spf_table) <= n:
+        size = 1 << max(16, n.bit_length())
+        if size > 1 << 32:
+            raise ValueError(f"factor tables are limited to values below 2**32, got {n}")
+        base = _odd_base_primes(math.isqrt(size - 1))[::-1] + [2]
+        # largest primes first, so the smallest prime factor is written last
+        if np is not None:
+            spf = array.array("I", bytes(4 * size))
+            view = np.frombuffer(spf, dtype=np.uint32)
+            view[:] = np.arange(size, dtype=np.uint32)
+            for p in base:
+                view[p * p::p] = p
+            del view
+        else:
+            spf = array.array("I", range(size))
+            for p in base:
+                spf[p * p::p] = array.array("I", [p]) * len(range(p * p, size, p))
+        _spf_table = spf
+    return _spf_table
+
+
+def _omega_up_to(n: int):
+    """Return the cached table of Omega(n), extending it with a linear pass over the SPF table.
 
+    Omega(i) = Omega(i // spf(i)) + 1, and i // spf(i) < 2**k for i in [2**k, 2**(k+1)),
+    so every power-of-two block only depends on the blocks before it.
+    """
+    global _omega_table
+    if len(_omega_table) <= n:
+        spf = _spf_up_to(n)
+        size = len(spf)
+        start = max(len(_omega_table), 2)
+        omega = _omega_table + bytearray(size - len(_omega_table))
+        if np is not None:
+            view = np.frombuffer(omega, dtype=np.uint8)
+            spf_view = np.frombuffer(spf, dtype=np.uint32)
+            lo = start
+            while lo < size:
+                hi = min(size, 1 << lo.bit_length())
+                idx = np.arange(lo, hi, dtype=np.uint32)
+                view[lo:hi] = view[idx // spf_view[lo:hi]] + 1
+                lo = hi
+            del view, spf_view
+        else:
+            for i in range(start, size):
+                omega[i] = omega[i // spf[i]] + 1
+        _omega_table = omega
+    return _omega_table
+
+
+def count_prime_factors_up_to(n: int):
+    """Return Omega(k) (prime factors counted with multiplicity) for every 0 <= k <= n.
+
+    Returns a NumPy uint8 array when NumPy is installed, otherwise a bytearray.
+    """
+    if n < 0:
+        raise ValueError(f"count_prime_factors_up_to needs a non-negative integer, got {n}")
+    counts = _omega_up_to(n)[:n + 1]
+    return np.frombuffer(counts, dtype=np.uint8) if np is not None else counts
+
+
+def _check_positive_many(values, flat=None):
+    """Raise ValueError unless every value is a positive integer."""
+    if flat is not None:
+        if flat.dtype.kind not in "iu":
+            raise ValueError(f"expected an integer array, got dtype {flat.dtype}")
+        if flat.size and flat.min() < 1:
+            raise ValueError("prime factor counts need positive integers")
+    elif any(v < 1 for v in values):
+        raise ValueError("prime factor counts need positive integers")
+
+
+def count_prime_factors_many(values):
+    """Return Omega(v) for every value, using the cached SPF table for values up to 2**24.
+
+    Returns a NumPy int64 array of the same shape for NumPy input, else a list of ints.
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        flat = values.ravel()
+        _check_positive_many(None, flat)
+        out = np.zeros(flat.shape, dtype=np.int64)
+        small = flat <= _FACTOR_TABLE_LIMIT
+        if small.any():
+            vals = flat[small].astype(np.int64)
+            out[small] = np.frombuffer(_omega_up_to(int(vals.max())), dtype=np.uint8)[vals]
+        large = ~small
+        if large.any():
+            out[large] = [len(factorize(int(v))) for v in flat[large]]
+        return out.reshape(values.shape)
+    values = [int(v) for v in values]
+    _check_positive_many(values)
+    omega = _omega_up_to(max((v for v in values if v <= _FACTOR_TABLE_LIMIT), default=0))
+    return [omega[v] if v <= _FACTOR_TABLE_LIMIT else len(factorize(v)) for v in values]
+
+
+def is_allmost_prime_many(values):
+    """Check for many values whether each is a product of exactly two primes.
+
+    Returns a NumPy bool array of the same shape for NumPy input, else a list of bools.
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        flat = values.ravel()
+        if flat.dtype.kind not in "iu":
+            raise ValueError(f"expected an integer array, got dtype {flat.dtype}")
+        out = np.zeros(flat.shape, dtype=np.bool_)
+        small = (flat >= 1) & (flat <= _FACTOR_TABLE_LIMIT)
+        if small.any():
+            vals = flat[small].astype(np.int64)
+            out[small] = np.frombuffer(_omega_up_to(int(vals.max())), dtype=np.uint8)[vals] == 2
+        large = flat > _FACTOR_TABLE_LIMIT
+        if large.any():
+            out[large] = [is_allmost_prime(int(v)) for v in flat[large]]
+        return out.reshape(values.shape)
+    values = [int(v) for v in values]
+    omega = _omega_up_to(max((v for v in values if v <= _FACTOR_TABLE_LIMIT), default=0))
+    return [
+        (v >= 1 and omega[v] == 2) if v <= _FACTOR_TABLE_LIMIT else is_allmost_prime(v)
+        for v in values
+    ]
 
 def print_matrix(M) -> None:
     """get a 2D list and print it in a readable format"""
@@ -52,33 +435,260 @@ def print_tuples(tup) -> None:
     print(tup)
 
 
-def control_digit(id_num: int) -> str:
+_ID_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)  # digit sum of 2*d, for the doubled ID positions
+_ID_DOUBLED_ASCII = bytes.maketrans(b"0123456789", bytes(_ID_DOUBLED))
+_ID_READ_HINT = 1 << 22  # bytes of lines read per chunk from ID streams
+_ID_FILE_CHUNK = 8 << 20  # bytes per chunk in the ID file pipeline
+_ID_FILE_FORMATS = {".csv": "csv", ".tsv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def control_digit(id_num: str) -> str:
     """input: 8-digit string, output: control digit as string"""
     assert isinstance(id_num, str) and len(id_num) == 8
 
-    total = 0
-    for i in range(8):
-        val = int(id_num[i])
-        if i % 2 == 0:       
-            total += val
-        else:              
-            if val < 5:
-                total += 2 * val
-            else:
-                total += ((2 * val) % 10) + 1 
-                                         
-    total = total % 10           
-    check_digit = (10 - total) % 10
-
-    return str(check_digit)
+    total = sum(int(d) for d in id_num[0::2]) + sum(_ID_DOUBLED[int(d)] for d in id_num[1::2])
+    return str(-total % 10)
 
 
 def audit_ID(IDNumber: str) -> bool:
     """Check if the ID number is valid."""
     if len(IDNumber) != 9:
         return False
-    if not IDNumber[:-1].isdigit() or not IDNumber[-1].isdigit():
+    if not (IDNumber.isascii() and IDNumber.isdigit()):
+        return False
+    return control_digit(IDNumber[:-1]) == IDNumber[-1]
+
+
+def _audit_ascii(raw: bytes) -> bool:
+    """audit_ID on ASCII bytes. The '0' offsets of the five undoubled digits add 240, a multiple of 10."""
+    if len(raw) != 9 or not (raw.isdigit() and raw.isascii()):
         return False
-    audit_digit = control_digit(IDNumber)
-    return audit_digit == int(IDNumber[-1])
+    return (sum(raw[0::2]) + sum(raw[1::2].translate(_ID_DOUBLED_ASCII))) % 10 == 0
+
+
+def _audit_codes(codes):
+    """Validate a (rows, width) NumPy array of character codes, zero padded past the ID."""
+    rows, width = codes.shape
+    if width < 9:
+        return np.zeros(rows, dtype=np.bool_)
+    doubled = np.zeros(256, dtype=np.uint8)
+    doubled[:10] = _ID_DOUBLED
+    ok = np.ones(rows, dtype=np.bool_)
+    total = np.zeros(rows, dtype=np.uint8)
+    # column at a time: reductions along a 9-wide row axis are far slower
+    for j in range(9):
+        digit = codes[:, j] - codes.dtype.type(48)  # unsigned: non-digits wrap past 9
+        ok &= digit <= 9
+        digit = digit.astype(np.uint8, copy=False)  # rows that are not ok may hold garbage
+        total += doubled[digit] if j % 2 else digit
+    for j in range(9, width):
+        ok &= codes[:, j] == 0
+    return ok & (total % 10 == 0)
+
+
+def _audit_array(arr):
+    """Vectorized audit_ID over a NumPy array of str, bytes or integer IDs (integers are zero padded to 9 digits)."""
+    arr = arr.ravel()
+    if arr.dtype.kind == "U":
+        return _audit_codes(arr.view(np.uint32).reshape(arr.size, arr.dtype.itemsize // 4))
+    if arr.dtype.kind == "S":
+        return _audit_codes(arr.view(np.uint8).reshape(arr.size, arr.dtype.itemsize))
+    if arr.dtype.kind in "iu":
+        ok = (arr >= 0) & (arr < 10 ** 9)
+        values = np.where(ok, arr, 0).astype(np.int64)
+        digits = (values[:, None] // 10 ** np.arange(8, -1, -1, dtype=np.int64)) % 10
+        return _audit_codes((digits + 48).astype(np.uint8)) & ok
+    return _audit_array(np.array([v if isinstance(v, (str, bytes)) else str(v) for v in arr.tolist()]))
+
+
+def _audit_lines(lines):
+    """Validate a list of str/bytes IDs; returns a NumPy mask or a list of bools."""
+    if np is not None:
+        if not lines:
+            return np.zeros(0, dtype=np.bool_)
+        kind = "S" if isinstance(lines[0], bytes) else "U"
+        return _audit_array(np.array(lines, dtype=f"{kind}10"))
+    return [
+        _audit_ascii(v if isinstance(v, bytes) else str(v).encode("ascii", "replace"))
+        for v in lines
+    ]
+
+
+def _iter_id_chunks(stream):
+    """Yield lists of IDs (line endings stripped) read from a text or binary stream in large chunks."""
+    for lines in iter(lambda: stream.readlines(_ID_READ_HINT), []):
+        strip = b"\r\n" if isinstance(lines[0], bytes) else "\r\n"
+        yield [line.rstrip(strip) for line in lines]
+
+
+def audit_ID_many(ids):
+    """Validate many ID numbers at once.
+
+    ids: list/iterable of ID strings (or bytes), a NumPy array (str, bytes or int dtype),
+         or a text/binary file object with one ID per line.
+    returns: (mask, invalid) - a boolean mask of valid rows and the indices of the invalid rows,
+             as NumPy arrays when NumPy is installed, otherwise as lists.
+    """
+    if np is not None and isinstance(ids, np.ndarray):
+        mask = _audit_array(ids)
+    elif hasattr(ids, "readlines"):
+        masks = [_audit_lines(chunk) for chunk in _iter_id_chunks(ids)]
+        if np is not None:
+            mask = np.concatenate(masks) if masks else np.zeros(0, dtype=np.bool_)
+        else:
+            mask = [ok for chunk in masks for ok in chunk]
+    else:
+        mask = _audit_lines(list(ids))
+    if np is not None:
+        return mask, np.flatnonzero(~mask)
+    return mask, [i for i, ok in enumerate(mask) if not ok]
+
+
+def _id_from_json(value) -> str:
+    """Turn a JSON field into an ID string (integers are zero padded to 9 digits)."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+        return f"{value:09d}"
+    return ""
+
+
+def _audit_file_chunk(job):
+    """Validate one chunk of whole lines. Runs in worker processes, so it takes a single picklable tuple.
+
+    returns: (rows checked, [(row, offset, line) for every invalid row])
+    """
+    data, offset, row, fmt, field, delimiter = job
+    lines = data.split(b"\n")
+    if lines[-1] == b"":
+        lines.pop()
+    if fmt == "csv":
+        # decoding never adds or removes b"\n", so text lines line up with the byte lines
+        records = csv.reader(data.decode("utf-8", "replace").split("\n")[:len(lines)], delimiter=delimiter)
+        ids = [(rec[field] if len(rec) > field else "") if rec else None for rec in records]
+    elif fmt == "jsonl":
+        from .json_utils import loads_json
+
+        ids = []
+        for line in lines:
+            if not line.strip():
+                ids.append(None)
+                continue
+            try:
+                ids.append(_id_from_json(loads_json(line)[field]))
+            except (ValueError, KeyError, IndexError, TypeError):
+                ids.append("")
+    else:
+        ids = [line.rstrip(b"\r") or None for line in lines]
+    kept = [i for i, value in enumerate(ids) if value is not None]
+    if len(kept) < len(ids):
+        ids = [ids[i] for i in kept]
+    mask = _audit_lines(ids)
+    bad = [i for i, ok in zip(kept, mask) if not ok]
+    if not bad:
+        return len(kept), []
+    starts = list(itertools.accumulate((len(line) + 1 for line in lines), initial=offset))
+    return len(kept), [(row + i, starts[i], lines[i].rstrip(b"\r")) for i in bad]
+
+
+def _iter_file_chunks(f, offset: int, row: int, chunk_size: int):
+    """Yield (data, offset, first row) for chunks of whole lines read from a binary file."""
+    tail = b""
+    while True:
+        block = f.read(chunk_size)
+        if not block:
+            if tail:
+                yield tail, offset, row
+            return
+        data = tail + block
+        cut = data.rfind(b"\n") + 1
+        if not cut:
+            tail = data
+            continue
+        chunk, tail = data[:cut], data[cut:]
+        yield chunk, offset, row
+        offset += len(chunk)
+        row += chunk.count(b"\n")
+
+
+def _iter_chunk_results(jobs, workers):
+    """Run _audit_file_chunk over jobs in order, in-process or on a bounded process pool."""
+    if not workers:
+        yield from map(_audit_file_chunk, jobs)
+        return
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        pending = collections.deque()
+        for job in jobs:
+            pending.append(pool.submit(_audit_file_chunk, job))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _iter_audit_file(path, field, fmt, delimiter, header, chunk_size, workers):
+    """Yield per-chunk (rows, invalid) results for an ID file."""
+    ext = os.path.splitext(path)[1].lower()
+    fmt = fmt or _ID_FILE_FORMATS.get(ext, "lines")
+    if fmt not in ("csv", "jsonl", "lines"):
+        raise ValueError(f"Unknown ID file format: {fmt!r}")
+    if delimiter is None:
+        delimiter = "\t" if ext == ".tsv" else ","
+    if fmt == "jsonl" and field is None:
+        raise ValueError("JSONL input needs field=<key>")
+    if fmt == "csv":
+        field = 0 if field is None else field
+        header = isinstance(field, str) if header is None else header
+    with open(path, "rb") as f:
+        offset = row = 0
+        if fmt == "csv" and header:
+            first = f.readline()
+            offset, row = len(first), 1
+            if isinstance(field, str):
+                names = next(csv.reader([first.decode("utf-8-sig").rstrip("\r\n")], delimiter=delimiter), [])
+                if field not in names:
+                    raise ValueError(f"Column {field!r} not found in header of {path}")
+                field = names.index(field)
+        jobs = (
+            (data, start, first_row, fmt, field, delimiter)
+            for data, start, first_row in _iter_file_chunks(f, offset, row, chunk_size)
+        )
+        yield from _iter_chunk_results(jobs, workers)
+
+
+def iter_invalid_IDs(path: str, field=None, *, fmt: str = None, delimiter: str = None, header: bool = None,
+                     chunk_size: int = _ID_FILE_CHUNK, workers: int = None):
+    """Stream the invalid rows of a CSV/JSONL/plain ID file.
+
+    Yields (row, offset, line) for every invalid row: the 0-based line number, the byte offset of
+    the line and the raw line bytes. See audit_ID_file for the arguments.
+    """
+    for _, invalid in _iter_audit_file(path, field, fmt, delimiter, header, chunk_size, workers):
+        yield from invalid
+
+
+def audit_ID_file(path: str, field=None, *, fmt: str = None, delimiter: str = None, header: bool = None,
+                  invalid_path: str = None, chunk_size: int = _ID_FILE_CHUNK, workers: int = None) -> dict:
+    """Validate the IDs in a large CSV/JSONL/plain file with bounded memory.
 
+    path: file to read; the format comes from the suffix (.csv/.tsv, .jsonl/.ndjson, anything else is one ID per line)
+          unless fmt ("csv", "jsonl" or "lines") is given. Records must not span lines.
+    field: CSV column index or header name (default 0), or the JSONL key holding the ID.
+    header: whether the CSV has a header row (default: True when field is a name).
+    invalid_path: optional sidecar file receiving "row<TAB>offset<TAB>line" for every invalid row.
+    chunk_size: bytes read per chunk.
+    workers: number of processes to fan chunks out to (None validates in-process).
+    returns: {"rows": rows checked, "valid": ..., "invalid": ...}
+    """
+    rows = invalid_count = 0
+    sidecar = open(invalid_path, "wb") if invalid_path else None
+    try:
+        for checked, invalid in _iter_audit_file(path, field, fmt, delimiter, header, chunk_size, workers):
+            rows += checked
+            invalid_count += len(invalid)
+            if sidecar:
+                sidecar.writelines(b"%d\t%d\t%s\n" % item for item in invalid)
+    finally:
+        if sidecar:
+            sidecar.close()
+    return {"rows": rows, "valid": rows - invalid_count, "invalid": invalid_count}
@@ -1,4 +1,11 @@
+import asyncio
+import functools
+import queue
 import socket
+import struct
+import subprocess
+import threading
+import time
 
 __all__ = [
     name for name in globals()
@@ -7,35 +14,48 @@ __all__ = [
 ]
 
 
-def ping_host(host: str, count: int = 4, timeout: int = 2) -> tuple[bool, str]:
+PROBE_METHODS = ("ping", "tcp", "icmp", "auto")
+
+
+def ping_host(host: str, count: int = 4, timeout: int = 2, method: str = "ping", port: int = 80) -> tuple[bool, str]:
     """
     Ping a given host and return a tuple (reachable, output).
 
     host: hostname or IP address (string)
-    count: number of ping packets to send (int, default 4)
+    count: number of ping packets (or probes) to send (int, default 4)
     timeout: timeout per packet in seconds (int, default 2)
+    method: probe backend (string, default "ping"):
+        "ping" - run the system ping binary
+        "tcp"  - in-process TCP connect to `port`; a refused connection still counts as reachable
+        "icmp" - in-process ICMP echo over an unprivileged datagram socket (Linux/macOS)
+        "auto" - "icmp" when the kernel allows it, otherwise "tcp"
+    port: TCP port used by the "tcp" method (int, default 80)
 
     returns: tuple (is_reachable: bool, output: str)
     """
     
     if not is_hostname_valid(host) and not is_ip_valid(host):
         return False, "Invalid host"
+    if method not in PROBE_METHODS:
+        return False, f"Unknown probe method: {method}"
+    if method == "auto":
+        method = "icmp" if _icmp_socket_supported() else "tcp"
+    if method == "tcp":
+        return _tcp_probe(host, port, count, timeout)
+    if method == "icmp":
+        return _icmp_probe(host, count, timeout)
 
     try:
-        import platform
-        import shutil
-        import subprocess
-
-        if shutil.which("ping") is None:
+        ping_path, is_windows = _ping_tool()
+        if ping_path is None:
             return (False, "ping utility not found")
 
-        system = platform.system().lower()
-        if system == "windows":
+        if is_windows:
             # -n: number of pings, -w: timeout in milliseconds
-            args = ["ping", "-n", str(count), "-w", str(int(timeout * 1000)), host]
+            args = [ping_path, "-n", str(count), "-w", str(int(timeout * 1000)), host]
         else:
             # -c: count, -W: timeout in seconds (may vary across platforms)
-            args = ["ping", "-c", str(count), "-W", str(int(timeout)), host]
+            args = [ping_path, "-c", str(count), "-W", str(int(timeout)), host]
 
         completed = subprocess.run(args, capture_output=True, text=True, timeout=max(10, count * timeout + 5))
         output = (completed.stdout or "") + ("\n" + completed.stderr if completed.stderr else "")
@@ -46,33 +66,137 @@ def ping_host(host: str, count: int = 4, timeout: int = 2) -> tuple[bool, str]:
         return (False, str(e))
 
     
-def ping(host: str, timeout: int = 2, count: int = 1) -> bool:
+def ping(host: str, timeout: int = 2, count: int = 1, method: str = "ping", port: int = 80) -> bool:
     """
     Ping a host and return True if any reply is received, otherwise False.
 
     host: hostname or IP address (string)
     timeout: timeout per packet in seconds (default 2)
     count: number of ping packets to send (default 1)
+    method: probe backend, see ping_host (default "ping")
+    port: TCP port used by the "tcp" method (default 80)
     """
     try:
-        reachable, _ = ping_host(host, count=count, timeout=timeout)
+        reachable, _ = ping_host(host, count=count, timeout=timeout, method=method, port=port)
         return bool(reachable)
     except Exception:
         return False
 
 
-def am_I_online(timeout: int = 5) -> bool:
+def am_I_online(timeout: int = 5, method: str = "ping", port: int = 53) -> bool:
     """
     Check if the local machine has internet connectivity.
 
     Tries to ping a well-known public DNS server
+
+    method: probe backend, see ping_host (default "ping")
+    port: TCP port used by the "tcp" method (default 53, DNS)
     """
     dns_servers =["1.1.1.1","8.8.8.8","9.9.9.9"]
     for server in dns_servers:
-        if ping(server, timeout=timeout):
+        if ping(server, timeout=timeout, method=method, port=port):
             return True
+    return False
+
+
+@functools.cache
+def _ping_tool() -> tuple[str | None, bool]:
+    """
+    Locate the ping binary and detect Windows once per process.
+    returns: tuple (path to ping or None, is_windows)
+    """
+    import platform
+    import shutil
+
+    return shutil.which("ping"), platform.system().lower() == "windows"
+
+
+@functools.cache
+def _icmp_socket_supported() -> bool:
+    """
+    Return True if this process may open an unprivileged ICMP datagram socket
+    (on Linux this is governed by net.ipv4.ping_group_range). Checked once.
+    """
+    try:
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP).close()
+        return True
+    except (OSError, AttributeError):
+        return False
+
+
+def _tcp_probe(host: str, port: int, count: int, timeout: float) -> tuple[bool, str]:
+    """
+    inputs: host (str), port (int), count (int), timeout (float)
+    returns tuple (is_reachable, message) based on up to `count` TCP connect attempts.
+    An accepted or refused connection both prove the host is up.
+    """
+    if not is_port_valid(port):
+        return False, "Invalid port number"
+    message = "no response"
+    for _ in range(max(1, count)):
+        start = time.perf_counter()
+        try:
+            socket.create_connection((host, int(port)), timeout=timeout).close()
+            state = "open"
+        except ConnectionRefusedError:
+            state = "refused"
+        except OSError as e:
+            message = str(e) or "timed out"
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        return True, f"tcp {host}:{port} {state} in {elapsed:.2f} ms"
+    return False, message
+
+
+def _icmp_checksum(data: bytes) -> int:
+    """Internet checksum (RFC 1071) of data."""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _icmp_probe(host: str, count: int, timeout: float) -> tuple[bool, str]:
+    """
+    inputs: host (str), count (int), timeout (float)
+    returns tuple (is_reachable, message) after sending up to `count` ICMP echo
+    requests over an unprivileged datagram socket.
+    """
+    if not _icmp_socket_supported():
+        return False, "unprivileged ICMP sockets not permitted"
+    try:
+        address = socket.gethostbyname(host)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+    except OSError as e:
+        return False, str(e)
+    payload = b"common-ping"
+    with sock:
+        for seq in range(max(1, count)):
+            # The kernel rewrites the identifier to the socket's own id.
+            header = struct.pack("!BBHHH", 8, 0, 0, 0, seq)
+            packet = struct.pack("!BBHHH", 8, 0, _icmp_checksum(header + payload), 0, seq) + payload
+            start = time.perf_counter()
+            deadline = start + timeout
+            try:
+                sock.sendto(packet, (address, 0))
+                while (remaining := deadline - time.perf_counter()) > 0:
+                    sock.settimeout(remaining)
+                    data = sock.recv(1024)
+                    if data and data[0] >> 4 == 4:
+                        # Some platforms (macOS) include the IP header.
+                        data = data[(data[0] & 0x0F) * 4:]
+                    if len(data) >= 8 and data[0] == 0 and struct.unpack("!H", data[6:8])[0] == seq:
+                        elapsed = (time.perf_counter() - start) * 1000
+                        return True, f"icmp reply from {address} seq={seq} in {elapsed:.2f} ms"
+            except socket.timeout:
+                continue
+            except OSError as e:
+                return False, str(e)
+    return False, "no reply"
+
 
-    
 def get_local_ip() -> str:
     """
     Return the local machine's IP address as a string.
@@ -192,7 +316,7 @@ def is_port_open(host: str, port: int, timeout: float = 1.0, returntuple: bool =
     return _tuple_is_port_open(host, port, timeout=timeout)[0]
 
 
-def ping_list(hosts: list[str], timeout: int = 2, count: int = 1, show_progress: bool = False) -> dict[str, bool]:
+def ping_list(hosts: list[str], timeout: int = 2, count: int = 1, show_progress: bool = False, concurrency: int = 32) -> dict[str, bool]:
     """
     Ping a list of hosts and return a dictionary mapping each host to
     its reachability status (True/False).
@@ -200,42 +324,110 @@ def ping_list(hosts: list[str], timeout: int = 2, count: int = 1, show_progress:
     hosts: list of hostnames or IP addresses (list of strings)
     timeout: timeout per packet in seconds (int, default 2)
     count: number of ping packets to send (int, default 1)
+    show_progress: print each host as its ping completes (bool, default False)
+    concurrency: maximum number of pings running at once (int, default 32, 1 pings sequentially)
 
-    returns: dict {host: is_reachable}
+    returns: dict {host: is_reachable}, in the order the hosts were given
     """
-    results = {}
-    for host in hosts:
-        results[host] = ping(host, timeout=timeout, count=count)
+    results = dict.fromkeys(hosts, False)
+    for host, reachable in iter_ping_list(results, timeout=timeout, count=count, concurrency=concurrency):
+        results[host] = reachable
         if show_progress:
-            print(f"Pinged {host}: {'Reachable' if results[host] else 'Unreachable'}")
-    return results   
+            print(f"Pinged {host}: {'Reachable' if reachable else 'Unreachable'}")
+    return results
 
 
-def free_port_scanner(host: str, start_port: int, end_port: int, timeout: float = 1.0, show_progress: bool = False) -> list[int]:
+def iter_ping_list(hosts: list[str], timeout: int = 2, count: int = 1, concurrency: int = 32):
+    """
+    Ping a list of hosts in parallel and yield (host, reachable) tuples as
+    each ping finishes. Closing the generator early cancels pings that have
+    not started yet.
+
+    hosts: list of hostnames or IP addresses (list of strings)
+    timeout: timeout per packet in seconds (int, default 2)
+    count: number of ping packets to send (int, default 1)
+    concurrency: maximum number of pings running at once (int, default 32)
+
+    yields: tuple (host, is_reachable) in completion order
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    hosts = list(dict.fromkeys(hosts))
+    if not hosts:
+        return
+    executor = ThreadPoolExecutor(max_workers=min(concurrency, len(hosts)), thread_name_prefix="ping")
+    try:
+        futures = {executor.submit(ping, host, timeout, count): host for host in hosts}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def ping_list_async(hosts: list[str], timeout: int = 2, count: int = 1, concurrency: int = 32):
+    """
+    Async generator counterpart of iter_ping_list: ping hosts in parallel and
+    yield (host, reachable) tuples as each ping finishes, without blocking
+    the event loop.
+
+    hosts: list of hostnames or IP addresses (list of strings)
+    timeout: timeout per packet in seconds (int, default 2)
+    count: number of ping packets to send (int, default 1)
+    concurrency: maximum number of pings running at once (int, default 32)
+
+    yields: tuple (host, is_reachable) in completion order
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    hosts = list(dict.fromkeys(hosts))
+    if not hosts:
+        return
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=min(concurrency, len(hosts)), thread_name_prefix="ping")
+    futures = {asyncio.ensure_future(loop.run_in_executor(executor, ping, host, timeout, count)): host for host in hosts}
+    try:
+        pending = set(futures)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield futures[future], future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def free_port_scanner(host: str, start_port: int, end_port: int, timeout: float = 1.0, show_progress: bool = False, concurrency: int = 256) -> list[int]:
     """
-    Scan a range of TCP ports on the given host and return a list of open ports.
+    Scan a range of TCP ports on the given host and return a list of free ports.
 
     host: hostname or IP address (string)
     start_port: starting port number (int)
     end_port: ending port number (int)
     timeout: timeout in seconds for each port check (float, default 1.0)
+    show_progress: print each port as its check completes (bool, default False)
+    concurrency: maximum number of port checks in flight (int, default 256)
 
-    returns: list of open port numbers (list of ints)
+    returns: sorted list of free port numbers (list of ints)
     """
     RED = "\033[91m"
     GREEN = "\033[92m"
     RESET = "\033[0m"
-    open_ports = []
-    for port in range(start_port, end_port + 1):
-        resalt= not is_port_open(host, port, timeout=timeout)
-        if resalt:
-            open_ports.append(port)
+    free_ports = []
+    for port, is_open in iter_scan_ports(host, range(start_port, end_port + 1), timeout=timeout, concurrency=concurrency):
+        if not is_open:
+            free_ports.append(port)
         if show_progress:
-            print(f"Checked port {port} {GREEN} Free{RESET}" if resalt else f"Checked port {port} {RED} Used{RESET}")
-    return open_ports
+            print(f"Checked port {port} {RED} Used{RESET}" if is_open else f"Checked port {port} {GREEN} Free{RESET}")
+    free_ports.sort()
+    return free_ports
 
 
-def scan_ports_list(host: str, ports: list[int], timeout: float = 1.0) -> dict[int, bool]:
+def scan_ports_list(host: str, ports: list[int], timeout: float = 1.0, concurrency: int = 256) -> dict[int, bool]:
     """
     Scan a list of TCP ports on the given host and return a dictionary
     mapping each port to its open status (True/False).
@@ -243,15 +435,159 @@ def scan_ports_list(host: str, ports: list[int], timeout: float = 1.0) -> dict[i
     host: hostname or IP address (string)
     ports: list of port numbers to check (list of ints)
     timeout: timeout in seconds for each port check (float, default 1.0)
+    concurrency: maximum number of port checks in flight (int, default 256)
 
-    returns: dict {port: is_open}
+    returns: dict {port: is_open}, in the order the ports were given
     """
-    results = {}
-    for port in ports:
-        results[port] = is_port_open(host, port, timeout=timeout)
+    results = dict.fromkeys(ports, False)
+    for port, is_open in iter_scan_ports(host, results, timeout=timeout, concurrency=concurrency):
+        results[port] = is_open
     return results
 
 
+async def _async_is_port_open(addresses, port: int, timeout: float) -> bool:
+    """
+    inputs: addresses (resolved addresses of one host, tried in order, like socket.create_connection),
+    port (int), timeout (float, per address)
+    returns True if a TCP connection to the port can be established within timeout
+    """
+    if not is_port_valid(port):
+        return False
+    for address in addresses:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(address, int(port)), timeout)
+            break
+        except Exception:
+            continue
+    else:
+        return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except Exception:
+        pass
+    return True
+
+
+async def scan_ports_async(host: str, ports, timeout: float = 1.0, concurrency: int = 256, check_host: bool = True):
+    """
+    Scan TCP ports on the given host concurrently and yield results as they arrive.
+
+    The host is validated, pinged and resolved once per scan rather than once
+    per port; each port is tried on every resolved address (e.g. ::1, then
+    127.0.0.1) until one accepts. If the host is invalid, unreachable or cannot
+    be resolved, every port is reported as closed.
+
+    host: hostname or IP address (string)
+    ports: iterable of port numbers to check
+    timeout: timeout in seconds for each connect attempt (float, default 1.0)
+    concurrency: maximum number of connect attempts in flight (int, default 256)
+    check_host: ping the host before scanning (bool, default True)
+
+    yields: tuple (port, is_open) in completion order
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    ports = list(ports)
+
+    addresses = None
+    if is_hostname_valid(host) or is_ip_valid(host):
+        reachable = True
+        if check_host:
+            reachable = await asyncio.to_thread(ping, host, timeout)
+        if reachable:
+            try:
+                infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+                addresses = list(dict.fromkeys(info[4][0] for info in infos))
+            except Exception:
+                addresses = None
+
+    if not addresses:
+        for port in ports:
+            yield port, False
+        return
+
+    results = asyncio.Queue()
+    pending = iter(ports)
+
+    async def worker():
+        # All workers share one iterator; the event loop is single-threaded so
+        # each port is handed out exactly once.
+        for port in pending:
+            await results.put((port, await _async_is_port_open(addresses, port, timeout)))
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(ports)))]
+    try:
+        for _ in range(len(ports)):
+            yield await results.get()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+def iter_scan_ports(host: str, ports, timeout: float = 1.0, concurrency: int = 256, check_host: bool = True):
+    """
+    Synchronous counterpart of scan_ports_async: yield (port, is_open) tuples
+    as each check completes. The scan runs on an event loop in a background
+    thread, so this can be used from plain (non-async) code.
+
+    host: hostname or IP address (string)
+    ports: iterable of port numbers to check
+    timeout: timeout in seconds for each connect attempt (float, default 1.0)
+    concurrency: maximum number of connect attempts in flight (int, default 256)
+    check_host: ping the host before scanning (bool, default True)
+
+    yields: tuple (port, is_open) in completion order
+    """
+    return _iterate_async(functools.partial(scan_ports_async, host, list(ports), timeout=timeout, concurrency=concurrency, check_host=check_host))
+
+
+_DONE = object()
+
+
+def _iterate_async(agen_factory):
+    """
+    Run the async generator returned by agen_factory() on a private event loop
+    in a daemon thread and yield its items synchronously as they are produced.
+    Exceptions raised by the async generator are re-raised in the caller.
+    Closing the returned generator early stops the async generator.
+    """
+    items = queue.Queue()
+    stop = threading.Event()
+
+    async def drain():
+        agen = agen_factory()
+        try:
+            async for item in agen:
+                items.put(item)
+                if stop.is_set():
+                    break
+        finally:
+            await agen.aclose()
+
+    def runner():
+        try:
+            asyncio.run(drain())
+        except BaseException as e:
+            items.put((_DONE, e))
+        else:
+            items.put((_DONE, None))
+
+    thread = threading.Thread(target=runner, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if type(item) is tuple and len(item) == 2 and item[0] is _DONE:
+                if item[1] is not None:
+                    raise item[1]
+                return
+            yield item
+    finally:
+        stop.set()
+
+
 def is_ip_valid(ip: str) -> bool:
     """
     Validate whether a given string is a valid IPv4 address.
@@ -1,4 +1,16 @@
+import atexit
+import contextvars
+import functools
+import inspect
+import itertools
+import logging
+import logging.handlers
+import math
+import queue
+import reprlib
+import threading
 import time
+import contextlib
 
 __all__ = [
     name for name in globals()
@@ -8,7 +20,25 @@ __all__ = [
 
 
 def baseWrapper(func):
-    """A base wrapper function that can be used as a template for other wrappers."""
+    """A base wrapper function that can be used as a template for other wrappers.
+    Coroutine functions, async generators and generators are wrapped so the result is reported
+    once it is awaited or fully iterated."""
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            print(f"Calling function '{func.__name__}' with args: {args} and kwargs: {kwargs}")
+            result = await func(*args, **kwargs)
+            print(f"Function '{func.__name__}' returned: {result}")
+            return result
+        return async_wrapper
+
+    if inspect.isasyncgenfunction(func) or inspect.isgeneratorfunction(func):
+        def on_finish(state, items):
+            print(f"Function '{func.__name__}' finished after yielding {items} items")
+        print_call = functools.partial(_print_call, func)
+        return _wrap_iteration(func, print_call, on_finish, count_items=True)
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         # Pre-processing code can go here (e.g. logging, input validation)
         print(f"Calling function '{func.__name__}' with args: {args} and kwargs: {kwargs}")
@@ -23,12 +53,498 @@ def baseWrapper(func):
     return wrapper
 
 
-def countTime(func):
-    """Decorator to measure the execution time of a function."""
+def _print_call(func, args, kwargs):
+    print(f"Calling function '{func.__name__}' with args: {args} and kwargs: {kwargs}")
+
+
+def _wrap_iteration(func, on_start, on_finish, count_items: bool = False):
+    """Wrap a generator or async generator function. state = on_start(args, kwargs) runs on the first
+    iteration; on_finish(state, items) runs once iteration ends, however it ends (exhaustion, error, close)."""
+    if inspect.isasyncgenfunction(func):
+        @functools.wraps(func)
+        async def async_gen_wrapper(*args, **kwargs):
+            state = on_start(args, kwargs)
+            items = 0
+            agen = func(*args, **kwargs)
+            try:
+                try:
+                    value = await agen.__anext__()
+                except StopAsyncIteration:
+                    return
+                while True:
+                    items += count_items
+                    try:
+                        sent = yield value
+                    except GeneratorExit:
+                        await agen.aclose()
+                        raise
+                    except BaseException as exc:
+                        try:
+                            value = await agen.athrow(exc)
+                        except StopAsyncIteration:
+                            return
+                    else:
+                        try:
+                            value = await agen.asend(sent)
+                        except StopAsyncIteration:
+                            return
+            finally:
+                on_finish(state, items)
+        return async_gen_wrapper
+
+    @functools.wraps(func)
+    def gen_wrapper(*args, **kwargs):
+        state = on_start(args, kwargs)
+        items = 0
+        gen = func(*args, **kwargs)
+        try:
+            if not count_items:
+                return (yield from gen)
+            # yield from, with a count of the produced items
+            try:
+                value = next(gen)
+            except StopIteration as stop:
+                return stop.value
+            while True:
+                items += 1
+                try:
+                    sent = yield value
+                except GeneratorExit:
+                    gen.close()
+                    raise
+                except BaseException as exc:
+                    try:
+                        value = gen.throw(exc)
+                    except StopIteration as stop:
+                        return stop.value
+                else:
+                    try:
+                        value = gen.send(sent)
+                    except StopIteration as stop:
+                        return stop.value
+        finally:
+            on_finish(state, items)
+    return gen_wrapper
+
+
+# HDR-style log-linear histogram over nanoseconds: values below 2**_SUB_BITS get their own
+# bucket, larger ones keep _SUB_BITS significant bits (< 1% relative error).
+_SUB_BITS = 7
+_MAX_NS_BITS = 46  # ~19.5 hours; slower calls land in the last bucket
+_BUCKETS = (_MAX_NS_BITS - _SUB_BITS + 2) << (_SUB_BITS - 1)
+_QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _bucket_index(ns: int) -> int:
+    """Histogram bucket of a duration in nanoseconds."""
+    if ns < 1 << _SUB_BITS:
+        return ns if ns > 0 else 0
+    shift = ns.bit_length() - _SUB_BITS
+    index = (shift << (_SUB_BITS - 1)) + (ns >> shift)
+    return index if index < _BUCKETS else _BUCKETS - 1
+
+
+def _bucket_value(index: int) -> float:
+    """Midpoint (in nanoseconds) of the values that fall into a bucket."""
+    if index < 1 << _SUB_BITS:
+        return float(index)
+    shift = (index >> (_SUB_BITS - 1)) - 1
+    low = (index - (shift << (_SUB_BITS - 1))) << shift
+    return low + ((1 << shift) - 1) / 2
+
+
+class _Histogram:
+    """Fixed-size latency histogram of one timed function."""
+
+    __slots__ = ("counts", "count", "total", "min", "max", "lock")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counts = [0] * _BUCKETS
+            self.count = 0
+            self.total = 0
+            self.min = 1 << 63
+            self.max = 0
+
+    def record(self, ns: int):
+        # _bucket_index inlined. The updates are read-modify-writes that another thread could
+        # interleave with (the GIL may switch between bytecodes, and free-threaded builds have
+        # no GIL), so they are made under the histogram's lock
+        if ns < 1 << _SUB_BITS:
+            index = ns if ns > 0 else 0
+        else:
+            shift = ns.bit_length() - _SUB_BITS
+            index = (shift << (_SUB_BITS - 1)) + (ns >> shift)
+            if index >= _BUCKETS:
+                index = _BUCKETS - 1
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += ns
+            if ns < self.min:
+                self.min = ns
+            if ns > self.max:
+                self.max = ns
+
+    def snapshot(self):
+        with self.lock:
+            count = self.count
+            return list(self.counts), count, self.total, self.min if count else 0, self.max
+
+    def percentiles(self, quantiles) -> list:
+        """Return the given quantiles (0..1) in nanoseconds, estimated from the bucket midpoints."""
+        counts, count, _, low, high = self.snapshot()
+        return _percentiles(counts, count, low, high, quantiles)
+
+
+def _percentiles(counts, count, low, high, quantiles) -> list:
+    """Walk the cumulative bucket counts once for all (sorted or not) quantiles."""
+    if not count:
+        return [0.0 for _ in quantiles]
+    order = sorted(range(len(quantiles)), key=lambda i: quantiles[i])
+    ranks = [max(1, math.ceil(quantiles[i] * count)) for i in order]
+    result = [0.0] * len(quantiles)
+    seen = 0
+    pos = 0
+    for index, bucket in enumerate(counts):
+        if not bucket:
+            continue
+        seen += bucket
+        while pos < len(ranks) and ranks[pos] <= seen:
+            result[order[pos]] = min(max(_bucket_value(index), low), high)
+            pos += 1
+        if pos == len(ranks):
+            break
+    return result
+
+
+_timings = {}  # (name, scope) -> _Histogram; scope None is the overall histogram
+_timings_lock = threading.Lock()
+_timing_scope = contextvars.ContextVar("timing_scope", default=None)
+_scope_counts = {}  # name -> number of scoped histograms it has
+_MAX_SCOPES_PER_FUNCTION = 64  # each histogram is _BUCKETS counters, so labels must be low-cardinality
+
+
+def _histogram(name: str, scope: str = None) -> _Histogram:
+    """Return the registry histogram for (name, scope), creating it on first use.
+    Returns None for a new scope once name already has _MAX_SCOPES_PER_FUNCTION of them."""
+    key = (name, scope)
+    hist = _timings.get(key)
+    if hist is None:
+        if scope is not None and _scope_counts.get(name, 0) >= _MAX_SCOPES_PER_FUNCTION:
+            return None
+        with _timings_lock:
+            hist = _timings.get(key)
+            if hist is None:
+                if scope is not None:
+                    if _scope_counts.get(name, 0) >= _MAX_SCOPES_PER_FUNCTION:
+                        return None
+                    _scope_counts[name] = _scope_counts.get(name, 0) + 1
+                hist = _timings[key] = _Histogram()
+    return hist
+
+
+@contextlib.contextmanager
+def timing_scope(label: str):
+    """Attribute countTime measurements made inside the block (in this thread or asyncio task,
+    via contextvars) to label as well, e.g. an endpoint or a worker name. Labels should be few:
+    past _MAX_SCOPES_PER_FUNCTION per function, new ones are only counted in the overall histogram."""
+    token = _timing_scope.set(label)
+    try:
+        yield
+    finally:
+        _timing_scope.reset(token)
+
+
+def _recorder(name: str):
+    """Return record(ns) adding a duration to name's histogram and, when set, to its current scope."""
+    record_all = _histogram(name).record
+    get_scope = _timing_scope.get
+
+    def record(ns: int):
+        record_all(ns)
+        scope = get_scope()
+        if scope is not None:
+            hist = _histogram(name, scope)
+            if hist is not None:
+                hist.record(ns)
+    return record
+
+
+def countTime(func=None, *, name: str = None):
+    """Decorator recording the execution time of a function in the timing registry.
+    Coroutine functions are timed until the awaited result, generators and async generators
+    over the full iteration. Use as @countTime or @countTime(name="..."); query with timing_stats()."""
+    if func is None:
+        return functools.partial(countTime, name=name)
+    key = name or f"{func.__module__}.{func.__qualname__}"
+    clock = time.perf_counter_ns
+
+    if inspect.iscoroutinefunction(func):
+        record = _recorder(key)
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                record(clock() - start)
+        return async_wrapper
+
+    if inspect.isasyncgenfunction(func) or inspect.isgeneratorfunction(func):
+        record = _recorder(key)
+
+        def on_start(args, kwargs):
+            return clock()
+
+        def on_finish(start, items):
+            record(clock() - start)
+        return _wrap_iteration(func, on_start, on_finish)
+
+    # the sync path is the hot one: _recorder inlined to save a call per invocation
+    record_all = _histogram(key).record
+    get_scope = _timing_scope.get
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
-        end_time = time.time()
-        result = func(*args, **kwargs)
-        print(f"Function '{func.__name__}' executed in {end_time - start_time:.6f} seconds.")
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            ns = clock() - start
+            record_all(ns)
+            scope = get_scope()
+            if scope is not None:
+                hist = _histogram(key, scope)
+                if hist is not None:
+                    hist.record(ns)
+    return wrapper
+
+
+def timing_percentile(name: str, q: float, scope: str = None) -> float:
+    """Return the q-quantile (0..1) of the recorded durations of name (within scope), in seconds."""
+    if not 0 <= q <= 1:
+        raise ValueError(f"Quantile must be between 0 and 1, got {q}")
+    if (name, scope) not in _timings:
+        raise KeyError(f"No timings recorded for {name!r}" + (f" in scope {scope!r}" if scope else ""))
+    return _timings[name, scope].percentiles((q,))[0] / 1e9
+
+
+def timing_stats(name: str = None, scope: str = None) -> dict:
+    """Return count/total/min/max/mean/p50/p95/p99 (seconds) for one timed function, or for all of them by name.
+    With scope, only the measurements made inside timing_scope(scope) are reported."""
+    if name is not None:
+        if (name, scope) not in _timings:
+            raise KeyError(f"No timings recorded for {name!r}" + (f" in scope {scope!r}" if scope else ""))
+        return _stats(_timings[name, scope])
+    return {key: _stats(hist) for (key, key_scope), hist in list(_timings.items()) if key_scope == scope}
+
+
+def timing_scopes() -> list:
+    """Return the scope labels that have recorded timings."""
+    return sorted({scope for _, scope in list(_timings) if scope is not None})
+
+
+def _stats(hist: _Histogram) -> dict:
+    counts, count, total, low, high = hist.snapshot()
+    p50, p95, p99 = _percentiles(counts, count, low, high, _QUANTILES)
+    return {
+        "count": count,
+        "total": total / 1e9,
+        "min": low / 1e9,
+        "max": high / 1e9,
+        "mean": total / count / 1e9 if count else 0.0,
+        "p50": p50 / 1e9,
+        "p95": p95 / 1e9,
+        "p99": p99 / 1e9,
+    }
+
+
+def reset_timings(name: str = None) -> None:
+    """Clear the recorded durations of one timed function, or of all of them. Scoped histograms
+    are dropped, which also frees their slots under _MAX_SCOPES_PER_FUNCTION."""
+    with _timings_lock:
+        for (key, scope), hist in list(_timings.items()):
+            if name is not None and key != name:
+                continue
+            if scope is None:
+                hist.reset()
+            else:
+                del _timings[key, scope]
+                _scope_counts[key] -= 1
+
+
+def export_timings_json(path: str = None) -> dict:
+    """Return timing_stats() for every timed function, plus "name[scope]" entries for scoped timings;
+    when path is given, also save it atomically as JSON."""
+    stats = {
+        key if scope is None else f"{key}[{scope}]": _stats(hist)
+        for (key, scope), hist in list(_timings.items())
+    }
+    if path is not None:
+        from .json_utils import atomic_save_json
+
+        atomic_save_json(path, stats)
+    return stats
+
+
+def _prometheus_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def export_timings_prometheus(metric: str = "function_duration_seconds") -> str:
+    """Return the timing registry in the Prometheus text exposition format (one summary per function,
+    plus one per function and scope labelled scope="...")."""
+    lines = [
+        f"# HELP {metric} Execution time of functions decorated with countTime.",
+        f"# TYPE {metric} summary",
+    ]
+    for (key, scope), hist in list(_timings.items()):
+        stats = _stats(hist)
+        label = f'function="{_prometheus_label(key)}"'
+        if scope is not None:
+            label += f',scope="{_prometheus_label(str(scope))}"'
+        for q, field in zip(_QUANTILES, ("p50", "p95", "p99")):
+            lines.append(f'{metric}{{{label},quantile="{q}"}} {stats[field]!r}')
+        lines.append(f"{metric}_sum{{{label}}} {stats['total']!r}")
+        lines.append(f"{metric}_count{{{label}}} {stats['count']}")
+    return "\n".join(lines) + "\n"
+
+
+_LOG_REPR_LIMIT = 200
+_log_queue = queue.SimpleQueue()
+_log_listener = None
+_log_listener_lock = threading.Lock()
+
+
+def _short_repr(obj, limit: int) -> str:
+    """repr of obj with containers shortened by reprlib and the text cut to limit characters."""
+    shortener = reprlib.Repr()
+    shortener.maxstring = shortener.maxother = limit
+    try:
+        text = shortener.repr(obj)
+    except Exception as e:
+        text = f"<unrepresentable {type(obj).__name__}: {e!r}>"
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+class _LogForwarder(logging.handlers.QueueListener):
+    """Listener thread draining (logger, record) pairs: hands each record to the logger it was made by,
+    which may be a logger that is not registered under its name (e.g. logging.Logger("audit"))."""
+
+    def handle(self, item):
+        logger, record = item
+        logger.handle(record)
+
+
+def _start_log_listener():
+    """Start the background thread draining the call-log queue (once per process)."""
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is None:
+            _log_listener = _LogForwarder(_log_queue)
+            _log_listener.start()
+            atexit.register(_log_listener.stop)
+
+
+def _sampler(sample_rate: int, max_per_second: float):
+    """Return should_log() implementing 1-in-N sampling and an optional per-second budget."""
+    if sample_rate < 1:
+        raise ValueError(f"sample_rate must be at least 1, got {sample_rate}")
+    if max_per_second is not None and max_per_second <= 0:
+        raise ValueError(f"max_per_second must be positive, got {max_per_second}")
+    counter = itertools.count()
+    window = [0.0, 0]  # start of the current one-second window, records logged in it
+    clock = time.monotonic
+
+    def should_log() -> bool:
+        if sample_rate > 1 and next(counter) % sample_rate:
+            return False
+        if max_per_second is None:
+            return True
+        now = clock()
+        if now - window[0] >= 1.0:
+            window[0], window[1] = now, 0
+        if window[1] >= max_per_second:
+            return False
+        window[1] += 1
+        return True
+    return should_log
+
+
+def logCalls(func=None, *, logger: logging.Logger = None, level: int = logging.DEBUG, sample_rate: int = 1,
+             max_per_second: float = None, max_repr: int = _LOG_REPR_LIMIT, background: bool = True):
+    """Decorator logging calls and results (like baseWrapper) through the logging module.
+
+    logger: logger to use (default: the logger named after the function's module)
+    level: log level of the call records
+    sample_rate: log 1 in sample_rate calls
+    max_per_second: cap on logged calls per second, on top of sample_rate
+    max_repr: maximum length of each argument/result repr
+    background: hand records to a queue drained by a background thread, so handler I/O never runs in the caller
+    Use as @logCalls or @logCalls(sample_rate=100, ...). Arguments of a sampled call are repr'd in the
+    caller, so the record shows their state at call time; only handler I/O is moved to the background."""
+    if func is None:
+        return functools.partial(logCalls, logger=logger, level=level, sample_rate=sample_rate,
+                                 max_per_second=max_per_second, max_repr=max_repr, background=background)
+    logger = logger or logging.getLogger(func.__module__)
+    should_log = _sampler(sample_rate, max_per_second)
+    code = getattr(func, "__code__", None)
+    path, line = (code.co_filename, code.co_firstlineno) if code else ("(unknown file)", 0)
+    if background:
+        _start_log_listener()
+
+    def log(msg, *args):
+        record = logger.makeRecord(logger.name, level, path, line, msg, args, None, func.__name__)
+        if background:
+            _log_queue.put((logger, record))
+        else:
+            logger.handle(record)
+
+    def log_call(args, kwargs) -> bool:
+        if not (logger.isEnabledFor(level) and should_log()):
+            return False
+        log("Calling function '%s' with args: %s and kwargs: %s",
+            func.__name__, _short_repr(args, max_repr), _short_repr(kwargs, max_repr))
+        return True
+
+    def log_error(exc):
+        log("Function '%s' raised: %s", func.__name__, _short_repr(exc, max_repr))
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if not log_call(args, kwargs):
+                return await func(*args, **kwargs)
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException as exc:
+                log_error(exc)
+                raise
+            log("Function '%s' returned: %s", func.__name__, _short_repr(result, max_repr))
+            return result
+        return async_wrapper
+
+    if inspect.isasyncgenfunction(func) or inspect.isgeneratorfunction(func):
+        def on_finish(logged, items):
+            if logged:
+                log("Function '%s' finished after yielding %d items", func.__name__, items)
+        return _wrap_iteration(func, log_call, on_finish, count_items=True)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not log_call(args, kwargs):
+            return func(*args, **kwargs)
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as exc:
+            log_error(exc)
+            raise
+        log("Function '%s' returned: %s", func.__name__, _short_repr(result, max_repr))
         return result
-    return wrapper
\ No newline at end of file
+    return wrapper